@@ -0,0 +1,90 @@
+"""
+1,000 HITL approvals: routine2() per key vs one approve_many() call,
+with a live KeyDetector rebuilding its index after every store change.
+First checks that an approved unknown-format key reaches all_parser.
+
+Runs in a temporary copy of the project, the real stores are untouched.
+
+    python -m benchmarks.bench_approvals
+"""
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+COPY = ["routines.py", "key_engine", "parsers", "benchmarks"]
+
+
+def approvals(n: int, tag: str):
+    fmts = ["ach", "wire", "swift"]
+    return [
+        (f"bench {tag} {i % 50}", f"BENCH {tag} KEY {i}", fmts[i % 3], i % 10 == 0)
+        for i in range(n)
+    ]
+
+
+def check_unknown_format(routines):
+    # unknown-format narratives are parsed by all_parser, so an approved
+    # unknown-format key must land in the "all" registry
+    from parsers.all.all_parser import all_parser
+
+    text = "ACME LLC BENCHX REF=123456 ORIG ID=42"
+    assert "BENCHX REF" not in all_parser(text)
+    routines.approve_many([("benchx ref", "BENCHX REF", "unknown")])
+    assert all_parser(text).get("BENCHX REF") == "123456", \
+        "approved unknown-format key is not split by all_parser"
+
+
+def _in_copy(n: int):
+    from key_engine.key_detector import KeyDetector
+    import routines
+
+    check_unknown_format(routines)
+
+    kd = KeyDetector()
+
+    t0 = time.perf_counter()
+    for a in approvals(n, "loop"):
+        routines.routine2(*a)
+        kd.refresh()
+    t_loop = time.perf_counter() - t0
+    rebuilds_loop = kd.reload_count
+
+    t0 = time.perf_counter()
+    routines.approve_many(approvals(n, "batch"), detector=kd)
+    t_batch = time.perf_counter() - t0
+    rebuilds_batch = kd.reload_count - rebuilds_loop
+
+    print(f"{n} approvals")
+    print(f"routine2 loop  {t_loop:8.2f}s  index rebuilds {rebuilds_loop - 1}")
+    print(f"approve_many   {t_batch:8.2f}s  index rebuilds {rebuilds_batch}")
+    print(f"speedup        {t_loop / t_batch:8.0f}x")
+
+
+def run(n: int = 1_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in COPY:
+            src = ROOT / name
+            if src.is_dir():
+                shutil.copytree(
+                    src, Path(tmp) / name,
+                    ignore=shutil.ignore_patterns("__pycache__", "*.pkl", "*.lock")
+                )
+            else:
+                shutil.copy(src, tmp)
+
+        subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_approvals", "--in-copy", str(n)],
+            cwd=tmp,
+            check=True
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--in-copy"]:
+        _in_copy(int(sys.argv[2]))
+    else:
+        run()
@@ -0,0 +1,82 @@
+"""
+Fuzzy lookup cost as the approved vocabulary grows: length-bucket scan
+(engine="bulk") vs q-gram candidate generation (engine="ngram").
+
+    python -m benchmarks.bench_candidates
+"""
+import random
+import time
+
+from key_engine.key_detector import KeyDetector
+from key_engine.variant_index import VariantIndex
+from benchmarks.narratives import synthetic_batch
+
+_SYLLABLES = [
+    "acct", "bank", "ref", "orig", "bene", "name", "id", "date", "trace",
+    "code", "desc", "pay", "remit", "info", "addr", "party", "inst", "num",
+    "type", "cust", "debtor", "cred", "purp", "ult", "chg", "sett", "val",
+]
+
+
+def grow_vocab(match_keys, extra: int, seed: int = 11):
+    rng = random.Random(seed)
+    grown = list(match_keys)
+    for i in range(extra):
+        words = [rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))]
+        grown.append((f"synthetic {i}", " ".join(words) + f" {i % 97}"))
+    return grown
+
+
+def query_phrases(kd: KeyDetector, n: int):
+    phrases = set()
+    for t in synthetic_batch(n):
+        t = kd._normalize_text(t)
+        tokens = kd._tokenize(t)
+        for i, j in kd._generate_windows(t, tokens):
+            phrases.add("".join(tok[0] for tok in tokens[i:j + 1]))
+    # fuzzy tier only: exact hits never reach the engines
+    return sorted(p for p in phrases if p not in kd.index.exact)
+
+
+def run(sizes=(0, 2_000, 20_000), n_narratives: int = 300):
+    kd = KeyDetector()
+    phrases = query_phrases(kd, n_narratives)
+
+    print(f"{len(phrases)} distinct fuzzy phrases")
+    print(
+        f"{'vocab':>7} {'bulk cand':>10} {'ngram cand':>11} "
+        f"{'bulk us':>9} {'ngram us':>9} {'speedup':>8}"
+    )
+
+    for extra in sizes:
+        keys = grow_vocab(kd.match_keys, extra)
+        bulk = VariantIndex(keys, kd.threshold, cache_size=0, engine="bulk")
+        ngram = VariantIndex(keys, kd.threshold, cache_size=0, engine="ngram")
+
+        # warm per-length choices / the q-gram postings
+        bulk.best_match(phrases[0])
+        ngram.best_match(phrases[0])
+
+        t0 = time.perf_counter()
+        out_bulk = [bulk.best_match(p) for p in phrases]
+        t_bulk = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        out_ngram = [ngram.best_match(p) for p in phrases]
+        t_ngram = time.perf_counter() - t0
+
+        assert out_bulk == out_ngram, "engines disagree"
+
+        # average number of variants fuzz.ratio actually scores
+        c_bulk = sum(len(bulk.choices_for(len(p))[0]) for p in phrases) / len(phrases)
+        c_ngram = sum(len(ngram.ngram_choices(p)[0]) for p in phrases) / len(phrases)
+
+        print(
+            f"{len(bulk.cleaned):>7} {c_bulk:>10.1f} {c_ngram:>11.1f} "
+            f"{t_bulk / len(phrases) * 1e6:>9.1f} "
+            f"{t_ngram / len(phrases) * 1e6:>9.1f} {t_bulk / t_ngram:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    run()
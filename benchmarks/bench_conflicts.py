@@ -0,0 +1,102 @@
+"""
+Scaling of KeyDetector conflict resolution + text rewrite with narrative
+length: the old quadratic accepted-list scan and re-slicing vs the sweep
+line and single-pass rewrite.
+
+    python -m benchmarks.bench_conflicts
+"""
+import copy
+import time
+
+from key_engine.key_detector import KeyDetector
+from benchmarks.narratives import synthetic_batch
+
+
+def legacy_resolve_conflicts(candidates):
+    candidates.sort(key=lambda c: c["start"])
+
+    accepted = []
+
+    for c in candidates:
+        keep = True
+
+        for a in accepted[:]:
+            overlap = not (c["end"] <= a["start"] or c["start"] >= a["end"])
+
+            if not overlap:
+                continue
+
+            if c["score"] > a["score"]:
+                accepted.remove(a)
+                continue
+
+            if c["score"] < a["score"]:
+                keep = False
+                break
+
+            if c["tokens"] > a["tokens"]:
+                accepted.remove(a)
+                continue
+            else:
+                keep = False
+                break
+
+        if keep:
+            accepted.append(c)
+
+    return accepted
+
+
+def legacy_rewrite_text(text: str, accepted):
+    accepted.sort(key=lambda c: c["start"], reverse=True)
+
+    for c in accepted:
+        text = text[:c["start"]] + c["canonical"] + text[c["end"]:]
+
+    return text
+
+
+def _time(fn, cases, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        work = copy.deepcopy(cases)
+        t0 = time.perf_counter()
+        out = [fn(text, cands) for text, cands in work]
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def run(lengths=(10, 50, 100, 200, 400), per_length: int = 20, repeat: int = 3):
+    kd = KeyDetector()
+
+    def legacy(text, cands):
+        return legacy_rewrite_text(text, legacy_resolve_conflicts(cands))
+
+    def current(text, cands):
+        return kd._rewrite_text(text, kd._resolve_conflicts(cands))
+
+    print(f"{'fields':>7} {'chars':>7} {'cands':>6} {'legacy ms':>10} {'sweep ms':>9} {'speedup':>8}")
+
+    for n_fields in lengths:
+        texts = synthetic_batch(per_length, seed=n_fields, min_fields=n_fields, max_fields=n_fields)
+        cases = []
+        for t in texts:
+            t = kd._normalize_text(t)
+            tokens = kd._tokenize(t)
+            cases.append((t, kd._match_windows(t, kd._generate_windows(t, tokens), tokens)))
+
+        t_old, out_old = _time(legacy, cases, repeat)
+        t_new, out_new = _time(current, cases, repeat)
+        assert out_old == out_new, "rewrite differs from the legacy resolver"
+
+        chars = sum(len(t) for t, _ in cases) / len(cases)
+        cands = sum(len(c) for _, c in cases) / len(cases)
+        print(
+            f"{n_fields:>7} {chars:>7.0f} {cands:>6.0f} "
+            f"{t_old / len(cases) * 1e3:>10.3f} {t_new / len(cases) * 1e3:>9.3f} "
+            f"{t_old / t_new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    run()
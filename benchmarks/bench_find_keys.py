@@ -0,0 +1,82 @@
+"""
+Old per-key find_keys scan vs the shared Aho-Corasick KeyMatcher, for
+every key parser's KEYS list, on real-length narratives.
+
+    python -m benchmarks.bench_find_keys
+"""
+import time
+
+from parsers.key_matcher import KeyMatcher
+from parsers.ach import ach_parser
+from parsers.wire import wire_parser
+from parsers.swift import swift_parser
+from parsers.all import all_parser
+from key_engine.key_detector import KeyDetector
+from benchmarks.narratives import synthetic_batch
+
+PARSERS = {
+    "ach": ach_parser,
+    "wire": wire_parser,
+    "swift": swift_parser,
+    "all": all_parser,
+}
+
+
+# ---- old implementation, kept verbatim for comparison ----
+
+def legacy_find_keys(text, key_list, allowed):
+    def is_standalone(text, i, k_len):
+        before = text[i - 1] if i > 0 else ' '
+        after  = text[i + k_len] if i + k_len < len(text) else ' '
+        return before in allowed and after in allowed
+
+    found = {}
+    reserved = []
+
+    for k in key_list:
+        k_len = len(k)
+        for i in range(len(text) - k_len + 1):
+            if text[i:i + k_len] != k:
+                continue
+            if not is_standalone(text, i, k_len):
+                continue
+            if any(s <= i < e for s, e in reserved):
+                continue
+
+            found[i] = k
+            reserved.append((i, i + k_len))
+
+    return dict(sorted(found.items()))
+
+
+def run(n: int = 500):
+    kd = KeyDetector()
+    # parsers see rewritten narratives
+    texts = [kd.rewrite(t)[0] for t in synthetic_batch(n)]
+    avg_len = sum(map(len, texts)) / len(texts)
+
+    print(f"{len(texts)} narratives, {avg_len:.0f} chars on average")
+    print(f"{'parser':>6} {'keys':>5} {'old ms':>8} {'new ms':>8} {'speedup':>8}")
+
+    for name, mod in PARSERS.items():
+        keys = mod.REGISTRY.current().keys
+        matcher = KeyMatcher(keys, mod.ALLOWED)
+
+        t0 = time.perf_counter()
+        old = [legacy_find_keys(t, keys, mod.ALLOWED) for t in texts]
+        t_old = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        new = [matcher.find(t) for t in texts]
+        t_new = time.perf_counter() - t0
+
+        assert old == new, f"{name}: matchers disagree"
+
+        print(
+            f"{name:>6} {len(keys):>5} {t_old / len(texts) * 1e3:>8.2f} "
+            f"{t_new / len(texts) * 1e3:>8.3f} {t_old / t_new:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+"""
+detect_format keyword scoring: the old per-keyword substring loop vs the
+compiled KeywordScorer, strict (whole words) and substring mode, plus how
+many narratives change format under strict scoring.
+
+    python -m benchmarks.bench_keyword_scoring [n_narratives]
+"""
+import sys
+import time
+from collections import Counter
+
+from parsers.narrative import narrative
+from util import KEYWORDS, SCORER, SUBSTRING_SCORER, detect_format
+from benchmarks.narratives import synthetic_batch
+
+
+def legacy_scores(t: str) -> dict:
+    scores = {k: 0 for k in KEYWORDS}
+    for fmt, items in KEYWORDS.items():
+        for keyword, weight in items:
+            if keyword in t:
+                scores[fmt] += weight
+    return scores
+
+
+def _time(fn, texts, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(texts) * 1e6
+
+
+def run(n: int = 50_000):
+    narrs = synthetic_batch(n)
+    texts = [narrative(t).detect for t in narrs]
+
+    assert all(SUBSTRING_SCORER.score(t)[0] == legacy_scores(t) for t in texts), \
+        "substring mode differs from the legacy scoring"
+
+    t_old = _time(legacy_scores, texts)
+    t_sub = _time(SUBSTRING_SCORER.score, texts)
+    t_strict = _time(SCORER.score, texts)
+
+    changed = Counter()
+    for t in narrs:
+        old, new = detect_format(t, strict=False), detect_format(t)
+        if old != new:
+            changed[f"{old} -> {new}"] += 1
+
+    print(f"narratives        : {n}")
+    print(f"substring loop    : {t_old:8.2f} us / narrative")
+    print(f"scorer, substring : {t_sub:8.2f} us / narrative")
+    print(f"scorer, strict    : {t_strict:8.2f} us / narrative")
+    print(f"speedup (strict)  : {t_old / t_strict:8.1f}x")
+    print(f"format changes    : {sum(changed.values())}")
+    for change, count in changed.most_common():
+        print(f"    {change:24s} {count}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
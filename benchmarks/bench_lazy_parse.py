@@ -0,0 +1,44 @@
+"""
+Counterparty-only batch: eager parser dicts vs lazy ParseResults.
+Peak traced memory while a batch of parse results is held, and time for
+parse + extract_payor_payee streamed one narrative at a time.
+
+    python -m benchmarks.bench_lazy_parse
+"""
+import time
+import tracemalloc
+
+from parsers.all.all_parser import all_parser
+from extract_payer_payee import extract_payor_payee
+from key_engine.key_detector import KeyDetector
+from benchmarks.narratives import synthetic_batch
+
+
+def run(n: int = 20_000):
+    kd = KeyDetector()
+    texts = [kd.rewrite(t)[0] for t in synthetic_batch(n)]
+
+    print(f"{n} narratives")
+    print(f"{'mode':>6} {'peak KiB':>9} {'stream s':>9}")
+
+    results = {}
+    for lazy in (False, True):
+        tracemalloc.start()
+        parsed = [all_parser(t, lazy=lazy) for t in texts]
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[lazy] = [extract_payor_payee(p) for p in parsed]
+        del parsed
+
+        t0 = time.perf_counter()
+        for t in texts:
+            extract_payor_payee(all_parser(t, lazy=lazy))
+        t_stream = time.perf_counter() - t0
+
+        print(f"{'lazy' if lazy else 'eager':>6} {peak // 1024:>9} {t_stream:>9.2f}")
+
+    assert results[False] == results[True], "lazy results differ"
+
+
+if __name__ == "__main__":
+    run()
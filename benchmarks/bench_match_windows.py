@@ -0,0 +1,112 @@
+"""
+Per-narrative cost of window generation + matching: the old all-windows
+full scan over match_keys vs delimiter-anchored spans scored through the
+length-pruned VariantIndex.
+
+    python -m benchmarks.bench_match_windows [n_narratives]
+"""
+import re
+import sys
+import time
+
+from rapidfuzz import fuzz
+
+from key_engine.key_detector import KeyDetector
+from benchmarks.narratives import synthetic_batch
+
+
+def legacy_generate_windows(text: str, max_words: int):
+    tokens = []
+    for m in re.finditer(r"[a-z0-9]+", text):
+        tokens.append((m.group(), m.start(), m.end()))
+
+    windows = []
+    for i in range(len(tokens)):
+        for w in range(1, max_words + 1):
+            if i + w <= len(tokens):
+                phrase = " ".join(tokens[j][0] for j in range(i, i + w))
+                start = tokens[i][1]
+                end = tokens[i + w - 1][2]
+                windows.append((phrase, start, end))
+
+    return windows
+
+
+def legacy_has_delimiter_after(text: str, end: int) -> bool:
+    tail = text[end:]
+
+    i = 0
+    while i < len(tail) and tail[i].isspace():
+        i += 1
+
+    if i < len(tail) and tail[i] in ":=":
+        return True
+
+    if i < len(tail) and tail[i].isalnum():
+        return False
+
+    while i < len(tail):
+        if tail[i] in ":=":
+            return True
+        if tail[i].isalnum():
+            return False
+        i += 1
+
+    return False
+
+
+def legacy_match_windows(kd: KeyDetector, text):
+    candidates = []
+
+    for phrase, start, end in legacy_generate_windows(text, kd.max_words or kd.index.max_words):
+        if not legacy_has_delimiter_after(text, end):
+            continue
+
+        phrase_clean = kd._clean(phrase)
+
+        best_canon = None
+        best_score = 0
+
+        for canon, variant in kd.match_keys:
+            score = fuzz.ratio(phrase_clean, kd._clean(variant))
+            if score >= kd.threshold and score > best_score:
+                best_canon = variant
+                best_score = score
+
+        if best_canon:
+            candidates.append({
+                "raw": phrase,
+                "canonical": best_canon,
+                "score": best_score,
+                "start": start,
+                "end": end,
+                "tokens": len(phrase.split())
+            })
+    return candidates
+
+
+def run(n: int = 300):
+    kd = KeyDetector()
+    texts = [kd._normalize_text(t) for t in synthetic_batch(n)]
+
+    t0 = time.perf_counter()
+    old = [legacy_match_windows(kd, t) for t in texts]
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = []
+    for t in texts:
+        tokens = kd._tokenize(t)
+        new.append(kd._match_windows(t, kd._generate_windows(t, tokens), tokens))
+    t_new = time.perf_counter() - t0
+
+    assert old == new, "candidates differ from the legacy scan"
+
+    print(f"narratives        : {n}")
+    print(f"legacy scan       : {t_old / n * 1e3:8.3f} ms / narrative")
+    print(f"anchored + index  : {t_new / n * 1e3:8.3f} ms / narrative")
+    print(f"speedup           : {t_old / t_new:8.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,71 @@
+"""
+Memory of a 1M-narrative batch held as parser dicts vs compact Records
+(all_parser(..., compact=True)), plus the cost of converting back with
+to_dict() at the boundary.
+
+Narratives are rewritten once from a pool of distinct synthetic ones and
+parsed n times, so every row holds its own values as in production.
+Memory is the deep size of the held batch, every object counted once
+(shared field tuples / interned names included once).
+
+    python -m benchmarks.bench_records [n]
+"""
+import sys
+import time
+
+from parsers.all.all_parser import all_parser
+from parsers.key_matcher import Record
+from key_engine.key_detector import KeyDetector
+from benchmarks.narratives import synthetic_batch
+
+
+def deep_size(obj) -> int:
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple)):
+            stack.extend(o)
+        elif isinstance(o, Record):
+            stack.append(o.fields)
+            stack.append(o.values)
+    return total
+
+
+def run(n: int = 1_000_000, pool: int = 20_000):
+    kd = KeyDetector()
+    texts = [t for t, _ in kd.rewrite_many(synthetic_batch(min(n, pool)))]
+
+    print(f"{n} narratives ({len(texts)} distinct)")
+    print(f"{'mode':>8} {'MiB':>8} {'B/row':>7} {'parse s':>8} {'to_dict s':>10}")
+
+    sample = {}
+    for compact in (False, True):
+        t0 = time.perf_counter()
+        batch = [all_parser(texts[i % len(texts)], compact=compact) for i in range(n)]
+        t_parse = time.perf_counter() - t0
+
+        held = deep_size(batch)
+
+        t0 = time.perf_counter()
+        dicts = [r.to_dict() for r in batch] if compact else batch
+        t_conv = time.perf_counter() - t0 if compact else 0.0
+        sample[compact] = dicts[:len(texts)]
+
+        mode = "records" if compact else "dicts"
+        print(f"{mode:>8} {held / 2 ** 20:>8.0f} {held / n:>7.0f} {t_parse:>8.1f} {t_conv:>10.1f}")
+        del batch, dicts
+
+    assert sample[False] == sample[True], "records differ from dicts"
+
+
+if __name__ == "__main__":
+    run(*map(int, sys.argv[1:2]))
@@ -0,0 +1,63 @@
+"""
+Batch rewrite: rewrite_many() vs a plain rewrite() loop over the same
+narratives, fresh detectors (cold phrase memo) and warm, plus a check
+that both return the same results and the same tier counters.
+
+    python -m benchmarks.bench_rewrite_many [n_narratives]
+"""
+import sys
+import time
+
+from key_engine.key_detector import KeyDetector
+from benchmarks.narratives import synthetic_batch
+
+
+def _time(fn, repeat: int = 3):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def _loop(texts):
+    kd = KeyDetector()
+    return [kd.rewrite(t) for t in texts]
+
+
+def run(n: int = 20_000):
+    texts = synthetic_batch(n)
+
+    # cold: a new detector per run, nothing memoised yet
+    t_loop, expected = _time(lambda: _loop(texts))
+    t_batch, got = _time(lambda: KeyDetector().rewrite_many(texts))
+    assert got == expected, "rewrite_many differs from the rewrite() loop"
+
+    # tier counters as if every phrase went through rewrite(); cache stats
+    # differ once a phrase is evicted and scored again
+    loop_kd, batch_kd = KeyDetector(), KeyDetector()
+    [loop_kd.rewrite(t) for t in texts]
+    batch_kd.rewrite_many(texts)
+    for k in ("lookups", "exact_hits", "fuzzy_lookups", "fuzzy_hits"):
+        assert loop_kd.match_stats()[k] == batch_kd.match_stats()[k], f"rewrite_many {k} differs"
+
+    # warm: one detector, unbounded phrase memo filled by rewrite_many;
+    # neither path should score a phrase again
+    kd = KeyDetector(cache_size=None)
+    kd.rewrite_many(texts)
+    misses = kd.match_stats()["cache_misses"]
+    t_loop_w, _ = _time(lambda: [kd.rewrite(t) for t in texts])
+    t_batch_w, _ = _time(lambda: kd.rewrite_many(texts))
+    rescored = kd.match_stats()["cache_misses"] - misses
+    assert rescored == 0, f"{rescored} memoised phrases scored again"
+
+    print(f"narratives          : {n}")
+    print(f"rewrite loop, cold  : {t_loop:7.2f}s")
+    print(f"rewrite_many, cold  : {t_batch:7.2f}s  {t_loop / t_batch:.1f}x")
+    print(f"rewrite loop, warm  : {t_loop_w:7.2f}s")
+    print(f"rewrite_many, warm  : {t_batch_w:7.2f}s  {t_loop_w / t_batch_w:.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
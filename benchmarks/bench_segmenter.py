@@ -0,0 +1,129 @@
+"""
+The old two-pass key parsing, *_parser_v2(*_parser_v1(narr)): one key
+scan for KEYS, then one per value for INLINE_KEYS, vs the one-pass
+KeySegmenter the parsers use, for every key parser. Results must match.
+
+    python -m benchmarks.bench_segmenter [n_narratives]
+"""
+import sys
+import time
+
+from parsers.key_matcher import KeyMatcher
+from parsers.ach import ach_parser
+from parsers.wire import wire_parser
+from parsers.swift import swift_parser
+from parsers.all import all_parser
+from key_engine.key_detector import KeyDetector
+from benchmarks.narratives import synthetic_batch
+
+
+def _wire_whole(k):
+    return 'WIRE' in k or 'SRC' in k
+
+
+# name -> (module, parse, v1 key names, inline key names, values kept whole)
+PARSERS = {
+    "ach": (ach_parser, ach_parser.ach_parser, ach_parser.normalize_key, ach_parser.normalize_key, None),
+    "wire": (wire_parser, wire_parser.wire_parser, None, wire_parser.normalize_inline_key, _wire_whole),
+    "swift": (swift_parser, swift_parser.swift_parser, swift_parser.normalize_key, swift_parser.normalize_key, None),
+    "all": (all_parser, all_parser.all_parser, all_parser.normalize_key, all_parser.normalize_key, None),
+}
+
+
+# ---- old implementation, the parsers' v1 / v2 passes ----
+
+def legacy_v1(narr, find, key_name):
+    marks = find(narr)
+
+    idx = [0] + list(marks.keys()) + [len(narr)]
+    out = {}
+
+    out["Meta"] = narr[:idx[1]].strip()
+
+    for i in range(1, len(idx) - 1):
+        start, end = idx[i], idx[i + 1]
+        raw_k = marks[start]
+        k = key_name(raw_k) if key_name else raw_k
+
+        z = start + len(raw_k)
+        while z < len(narr) and not narr[z].isalnum():
+            z += 1
+
+        out[k] = narr[z:end].strip()
+
+    return out
+
+
+def legacy_split_inline_keys(text, find, inline_name):
+    marks = find(text)
+
+    if not marks:
+        return text.strip()
+
+    idx = [0] + list(marks.keys()) + [len(text)]
+    out = {}
+
+    out["value"] = text[:idx[1]].strip()
+
+    for i in range(1, len(idx) - 1):
+        start, end = idx[i], idx[i + 1]
+        raw_k = marks[start]
+        k = inline_name(raw_k)
+
+        z = start + len(raw_k)
+        while z < len(text) and not text[z].isalnum():
+            z += 1
+
+        out[k] = text[z:end].strip()
+
+    return out
+
+
+def legacy_v2(v1_output, find, inline_name, keep_whole):
+    out = {}
+
+    for k, v in v1_output.items():
+        if keep_whole and keep_whole(k):
+            out[k] = v
+        elif isinstance(v, str):
+            out[k] = legacy_split_inline_keys(v, find, inline_name)
+        else:
+            out[k] = v
+
+    return out
+
+
+def run(n: int = 2_000):
+    kd = KeyDetector()
+    # parsers see rewritten narratives
+    texts = [kd.rewrite(t)[0] for t in synthetic_batch(n)]
+
+    print(f"{len(texts)} narratives")
+    print(f"{'parser':>6} {'two-pass ms':>12} {'one-pass ms':>12} {'speedup':>8}")
+
+    for name, (mod, parse, key_name, inline_name, keep_whole) in PARSERS.items():
+        keys = mod.REGISTRY.current()
+        find_top = KeyMatcher(keys.keys, mod.ALLOWED).find
+        find_inline = KeyMatcher(keys.inline_keys, mod.ALLOWED).find
+
+        t0 = time.perf_counter()
+        old = [
+            legacy_v2(legacy_v1(t, find_top, key_name), find_inline, inline_name, keep_whole)
+            for t in texts
+        ]
+        t_old = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        new = [parse(t) for t in texts]
+        t_new = time.perf_counter() - t0
+
+        assert old == new, f"{name}: one-pass parse differs from v2(v1(narr))"
+
+        print(
+            f"{name:>6} {t_old / len(texts) * 1e3:>12.3f} "
+            f"{t_new / len(texts) * 1e3:>12.3f} {t_old / t_new:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -0,0 +1,64 @@
+import random
+
+
+# Real-shaped narratives, taken from the parser examples
+SAMPLES = [
+    "ORIG CO NAME=36 TREAS 310,ORIG ID=9101036151,DESC DATE=051425,ENTRY DESCR=MI SC PAY,ENTRY CLASS=CTX,TRACE NO=101036159719236,ENTRY DATE=250514,IND ID NO= 596012065360012,IND NAME=0017NORTH BROWARD HO,ORIG BANK=10103615",
+    "ACH Settlement TRANS TYPE=PPD SENDING CO. NAME=REALMANAGE LLC COMPANY ID=GENERATED DESCRIPTION=ACH OFFSET EFFECTIVE DATE=250502 RECV.ID NO=-SETT-ISOACHORG RECV. NAME=REALMANAG DISCRETIONARY DATA=04 TRACE NUMBER=025122004008569",
+    "TRANS TYPE = CCD SENDING CO NAME = APPLIED SYSTEMS COMPANY ID = 8263863381",
+    "Individual International Money Transfer Debit ORIG BANK ABA=071000288 ORIG BANK=BMO Bank N.A.     TYP=C REC BANK ABA=026005092 REC BANK=Wells Fargo Bank N FED REF=004484 SENT AT=2025/11/26 09:00 WIRE TYPE=FIO CURRENCY DESC=US DOLLAR EXCHANGE AMOUNT=000000000016300000USD EXCHANGE RATE=000001000000000 USD AMOUNT=000000000016300000 VALUE DATE=2025/11/26 COMM CHARGE=00000000 SRC=FIOF448425112609001500 SBR=OLBB20251126704+ 0 PLANO,TX,75093 US /AC-000003886256DD028 IBK=Wells Fargo Bank NA 375 PARK AVE NEW YORK CITY NY 10152 US /BC-PNBPUS3N NYC BBK=BANCO DE LA PRODUCCION, S.A. AV. AMAZONAS N35-211 Y JAPON QUITO PICHINC HA EC /BC-PRODECEQ BNF=MARTHA MOSQUERA NOTPROVIDED /AC-12673051647 OBI=ECUADOR CONTRACT",
+    "WIRE TRANSFER OUT        B          00  ORIGINATOR:INNOVAIRRE HOLDING CO LLC AC/8612045257 BENEFICIARY:BHAVYA KUMAR AC/910010016446103 M-1-303, SUN REAL HOMES, NEW RANIP AHMEDABAD BENEBNK:AXIS BANK LIMITED ABA:AXISINBB087 RFB: 202506800461 RECVBNK:BK AMER NYC ABA:026009593 BBI:/GOUR/ IBK:BANK OF AMERICA, N.A., NY ABA:026009593 TRN:256RG50222CN PARTIALREF:10109 DATE:250627 TIME:1250,FULL REFERENCE#:0627MMQFMPNB010109 UETR:6F2DE5AF-53A2-479B-B5C9-F08866B2A125",
+]
+
+# Key spellings seen across feeds, exact and slightly off
+_ACH_KEYS = [
+    "ORIG CO NAME", "ORIG C0 NAME", "ORIG CO NME", "SENDING CO NAME",
+    "SENDING CO. NAME", "ORIG ID", "DESC DATE", "ENTRY DESCR", "ENTRY DESC R",
+    "ENTRY CLASS", "TRACE NO", "TRACE NUMBR", "IND ID NO", "IND NAME",
+    "COMPANY ID", "COMPNY ID", "EFFECTIVE DATE", "RECV NAME", "BATCH DISCR",
+    "PMT RELATED INFO",
+]
+
+_WIRE_KEYS = [
+    "ORIG BANK ABA", "ORIG BANK", "REC BANK ABA", "REC BANK", "FED REF",
+    "FED REFF", "SENT AT", "WIRE TYPE", "CURRENCY DESC", "USD AMOUNT",
+    "VALUE DATE", "SRC", "SBR", "IBK", "BBK", "BNF", "OBI", "UETR", "TRN",
+    "SERVICE REF", "BENEFICIARY", "ORIGINATOR", "CUSTOMER REF NO",
+]
+
+_WORDS = [
+    "ACME", "HOLDINGS", "LLC", "TREAS", "PAYROLL", "NORTH", "BROWARD",
+    "WELLS", "FARGO", "BANK", "NA", "SUPPLY", "CO", "INC", "SERVICES",
+    "MARTHA", "MOSQUERA", "INVOICE", "CONTRACT", "US", "DOLLAR",
+]
+
+
+def _value(rng: random.Random) -> str:
+    if rng.random() < 0.5:
+        return str(rng.randrange(10 ** 5, 10 ** 15))
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def synthetic_batch(n: int, seed: int = 7, min_fields: int = 4, max_fields: int = 12):
+    """
+    Deterministic batch of ACH / WIRE shaped narratives.
+    """
+    rng = random.Random(seed)
+    out = []
+
+    for i in range(n):
+        if i % 10 == 0:
+            out.append(SAMPLES[(i // 10) % len(SAMPLES)])
+            continue
+
+        keys = _ACH_KEYS if rng.random() < 0.5 else _WIRE_KEYS
+        delim = rng.choice(["=", ":", " = ", ": "])
+        sep = rng.choice([",", " "])
+
+        fields = [
+            f"{rng.choice(keys)}{delim}{_value(rng)}"
+            for _ in range(rng.randint(min_fields, max_fields))
+        ]
+        out.append(sep.join(fields))
+
+    return out
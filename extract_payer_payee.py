@@ -1,4 +1,5 @@
 import re
+from collections.abc import Mapping
 from typing import Any, Dict, Optional
 
 
@@ -12,14 +13,16 @@ def extract_payor_payee(
     def norm(v):
         if v is None:
             return None
-        if isinstance(v, dict):
+        # dict, or a compact Record
+        if isinstance(v, Mapping):
             v = v.get("value") or v.get("name")
         s = str(v).strip()
         s = re.sub(r"\s+", " ", s)
         return s if s else None
 
-    # normalize keys (case-insensitive)
-    data = {k.lower(): v for k, v in parsed.items()}
+    # normalize keys (case-insensitive); values are only read for the
+    # keys looked up below, so lazy parse results stay lazy
+    keys = {k.lower(): k for k in parsed}
 
     # ---------------- role maps ----------------
     PAYER_KEYS = [
@@ -51,14 +54,14 @@ def extract_payor_payee(
 
     # ---------------- PRIORITY 1: direct role mapping ----------------
     for k in PAYER_KEYS:
-        if k in data:
-            payer = norm(data[k])
+        if k in keys:
+            payer = norm(parsed[keys[k]])
             if payer:
                 break
 
     for k in PAYEE_KEYS:
-        if k in data:
-            payee = norm(data[k])
+        if k in keys:
+            payee = norm(parsed[keys[k]])
             if payee:
                 break
 
@@ -72,8 +75,8 @@ def extract_payor_payee(
     # ---------------- PRIORITY 2: counterparty ----------------
     ctpty = None
     for k in COUNTERPARTY_KEYS:
-        if k in data:
-            ctpty = norm(data[k])
+        if k in keys:
+            ctpty = norm(parsed[keys[k]])
             if ctpty:
                 break
 
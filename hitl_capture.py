@@ -0,0 +1,231 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+from key_engine.store_file import write_json_atomic
+from parsers.key_registry import file_lock
+
+# unknown keys waiting for review, one record per (format, key)
+HITL_STORE = Path(__file__).resolve().parent / "hitl_pending.json"
+
+log = logging.getLogger(__name__)
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="seconds")
+
+
+class HitlCapture:
+    """
+    Unknown-key (HITL) events, kept off the request path.
+
+    capture() only appends to a deque. A daemon thread drains it every
+    `flush_interval` seconds, folds the events into one record per
+    (format, key) and merges those into `store`:
+
+        {"key", "format", "variants", "count",
+         "first_seen", "last_seen", "sample", "suggestions"}
+
+    `suggest`, e.g. KeyDetector.suggest, gives the top `top_k` nearest
+    canonical keys of a record's variants. It runs at flush time, only
+    for new records or records with new variants.
+    """
+
+    def __init__(
+        self,
+        store=HITL_STORE,
+        flush_interval: float = 5.0,
+        max_queue: int = 100_000,
+        suggest=None,
+        top_k: int = 3
+    ):
+        self.store = Path(store)
+        self.lock_path = self.store.with_name(self.store.name + ".lock")
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.suggest = suggest
+        self.top_k = top_k
+
+        # (ts, fmt, unknown keys, narrative), appended by capture()
+        self._events = deque()
+        # (fmt, key) -> record, aggregated but not yet in the store
+        self._records = {}
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.dropped = 0
+        self.flushes = 0
+
+    # REQUEST PATH
+    def capture(self, hitl, fmt: str, narrative: str):
+        """
+        Queue the HITL result of KeyDetector.rewrite(): (True, {KEY: variants}).
+        """
+        if len(self._events) >= self.max_queue:
+            # flusher behind: drop instead of growing without bound
+            self.dropped += 1
+            return
+
+        self._events.append((time.time(), fmt, hitl[1], narrative))
+
+        if self._thread is None:
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                # store unwritable / corrupt, suggest() failing, ...: records
+                # are kept, the flusher stays up and retries next interval
+                log.exception("HITL flush failed, retrying in %ss", self.flush_interval)
+
+    # AGGREGATION
+    def _drain(self):
+        events = self._events
+        records = self._records
+
+        while events:
+            ts, fmt, unknown, narrative = events.popleft()
+            for key, variants in unknown.items():
+                rec = records.get((fmt, key))
+                if rec is None:
+                    records[(fmt, key)] = {
+                        "key": key,
+                        "format": fmt,
+                        "variants": list(variants),
+                        "count": 1,
+                        "first_seen": ts,
+                        "last_seen": ts,
+                        "sample": narrative,
+                    }
+                    continue
+
+                rec["count"] += 1
+                rec["last_seen"] = ts
+                for v in variants:
+                    if v not in rec["variants"]:
+                        rec["variants"].append(v)
+
+    def _read_store(self) -> dict:
+        try:
+            data = json.loads(self.store.read_text(encoding="utf-8"))
+            return {(r["format"], r["key"]): r for r in data}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, KeyError, TypeError):
+            # unreadable store: every flush would fail on it and keep its
+            # records in memory, set it aside and start a new one
+            corrupt = self.store.with_name(self.store.name + ".corrupt")
+            os.replace(self.store, corrupt)
+            log.error("corrupt HITL store moved to %s, starting a new one", corrupt)
+            return {}
+
+    def flush(self) -> int:
+        """
+        Drains queued events and merges them into the store.
+        Returns the number of records written.
+        """
+        with self._lock:
+            self._drain()
+            if not self._records:
+                return 0
+
+            records, self._records = self._records, {}
+            try:
+                with file_lock(self.lock_path):
+                    stored = self._read_store()
+                    # records whose suggestions are missing or stale
+                    changed = []
+
+                    for k, rec in records.items():
+                        first, last = _iso(rec["first_seen"]), _iso(rec["last_seen"])
+                        old = stored.get(k)
+                        if old is None:
+                            stored[k] = dict(rec, first_seen=first, last_seen=last)
+                            changed.append(stored[k])
+                            continue
+
+                        old["count"] += rec["count"]
+                        old["first_seen"] = min(old["first_seen"], first)
+                        old["last_seen"] = max(old["last_seen"], last)
+                        n = len(old["variants"])
+                        for v in rec["variants"]:
+                            if v not in old["variants"]:
+                                old["variants"].append(v)
+                        if len(old["variants"]) > n or "suggestions" not in old:
+                            changed.append(old)
+
+                    if self.suggest is not None and changed:
+                        found = self.suggest([r["variants"] for r in changed], self.top_k)
+                        for r, sug in zip(changed, found):
+                            r["suggestions"] = sug
+
+                    write_json_atomic(
+                        self.store,
+                        sorted(stored.values(), key=lambda r: -r["count"])
+                    )
+            except BaseException:
+                # put them back, nothing is lost on a failed write
+                self._records = records
+                raise
+
+            self.flushes += 1
+            return len(records)
+
+    def pending(self) -> list:
+        """
+        Store records, most frequent first, after flushing the queue.
+        """
+        self.flush()
+        return sorted(self._read_store().values(), key=lambda r: -r["count"])
+
+    def discard(self, records) -> int:
+        """
+        Removes reviewed records (pending() dicts or (format, key) pairs)
+        from the store, e.g. once approve_many() has applied them.
+        Returns the number of records removed.
+        """
+        keys = {(r["format"], r["key"]) if isinstance(r, dict) else tuple(r) for r in records}
+
+        # queued events of these keys go in first, and out with them
+        self.flush()
+        with self._lock, file_lock(self.lock_path):
+            stored = self._read_store()
+            removed = [k for k in keys if stored.pop(k, None) is not None]
+            if removed:
+                write_json_atomic(
+                    self.store,
+                    sorted(stored.values(), key=lambda r: -r["count"])
+                )
+        return len(removed)
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval)
+        self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._events),
+            "unflushed_records": len(self._records),
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+        }
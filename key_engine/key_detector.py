@@ -1,47 +1,333 @@
+import hashlib
 import json
 import re
+import sys
+import threading
+import time
+from bisect import bisect_left
 from pathlib import Path
-from rapidfuzz import fuzz
+
+from key_engine.store_file import file_changed, file_stamp, read_stamped
+from key_engine.variant_index import VariantIndex, load_snapshot, write_snapshot
 
 
 BASE_DIR = Path(__file__).parent
 CANONICAL_FILE = BASE_DIR / "canonical_keys.json"
+# precompiled, deduplicated index of CANONICAL_FILE (see build_snapshot)
+SNAPSHOT_FILE = BASE_DIR / "canonical_keys.index.pkl"
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# a ':' / '=' after a token end, with only non-word chars in between
+DELIM_AFTER_RE = re.compile(r"(?<=[a-z0-9])(?:[^\w:=]|_)*[:=]")
+
+# HITL scan: `word:` / `word=` keys, and words + delimiters for look-back
+HITL_KEY_RE = re.compile(r"\b([a-z][a-z0-9]*)\s*[:=]")
+WORD_RE = re.compile(r"[a-z0-9]+|[:=]")
+
+
+def _compile_index(
+    raw: bytes,
+    version: str,
+    threshold: int = 85,
+    cache_size: int = 100_000,
+    engine: str = "bulk"
+):
+    canonical_map = json.loads(raw.decode("utf-8"))
+
+    match_keys = []
+    for canon, variants in canonical_map.items():
+        for v in variants:
+            match_keys.append((canon, v))
+
+    # cleaned + length-bucketed variants, built once
+    return VariantIndex(match_keys, threshold, cache_size, version=version, engine=engine)
+
+
+def store_version(raw: bytes) -> str:
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def build_snapshot(source=CANONICAL_FILE, dest=SNAPSHOT_FILE) -> str:
+    """
+    Build step: compile `source` and write the snapshot next to it.
+    Returns the store version the snapshot was built from.
+    """
+    raw = Path(source).read_bytes()
+    version = store_version(raw)
+    write_snapshot(_compile_index(raw, version), dest)
+    return version
 
 
 class KeyDetector:
-    def __init__(self, threshold: int = 85, max_words: int = 7):
+    def __init__(
+        self,
+        threshold: int = 85,
+        max_words: int | None = 7,
+        cache_size: int = 100_000,
+        reload_interval: float = 1.0,
+        engine: str = "bulk",
+        template_cache: int = 0
+    ):
         self.threshold = threshold
+        # window size in tokens, None -> longest variant in the vocabulary;
+        # windows too long to reach `threshold` are skipped either way
         self.max_words = max_words
+        # phrase -> match memo, per index (see VariantIndex)
+        self.cache_size = cache_size
+        # fuzzy candidate generation, see VariantIndex / NgramIndex;
+        # "bulk" is faster below about 2k variants, "ngram" past that
+        self.engine = engine
+        # narrative shape -> rewrite plan, 0 = off (see _shape)
+        self.template_cache = template_cache
+        # seconds between canonical_keys.json change checks
+        self.reload_interval = reload_interval
+        self._last_check = time.monotonic()
+
+        self._reload_lock = threading.Lock()
+        self._reloading = False
+        self.reload_count = 0
+        self.last_reload_seconds = None
+
         self._load_keys()
 
     
     # LOAD CANONICAL KEYS
     
     def _load_keys(self):
-        with open(CANONICAL_FILE, "r", encoding="utf-8") as f:
-            self.canonical_map = json.load(f)
+        self._swap(self._build_index())
 
-        self.match_keys = []
-        self.all_variants = set()
+    def _build_index(self, expected_version: str | None = None):
+        """
+        Reads canonical_keys.json and compiles a complete VariantIndex.
+        Nothing is published here; returns None when the content hash
+        equals `expected_version` (file touched, content unchanged).
+        """
+        t0 = time.perf_counter()
+
+        stamp, raw = read_stamped(CANONICAL_FILE, CANONICAL_FILE.read_bytes)
+        version = store_version(raw)
+        if version == expected_version:
+            return None
+
+        snap = load_snapshot(SNAPSHOT_FILE, version)
+        if snap is not None:
+            index = VariantIndex.from_snapshot(
+                snap, self.threshold, self.cache_size, self.engine
+            )
+        else:
+            # no snapshot, or built from an older store: compile the JSON
+            index = _compile_index(
+                raw, version, self.threshold, self.cache_size, self.engine
+            )
+
+        index.stamp = stamp
+        index.build_seconds = time.perf_counter() - t0
+        return index
+
+    def _swap(self, index):
+        self.index = index
+        self.last_reload_seconds = index.build_seconds
+        self.reload_count += 1
+
+    @property
+    def index_version(self) -> str:
+        return self.index.version
+
+    @property
+    def match_keys(self):
+        return self.index.match_keys
+
+    
+    def _stale(self) -> bool:
+        return file_changed(CANONICAL_FILE, self.index.stamp)
+
+    def _reload(self):
+        try:
+            try:
+                index = self._build_index(expected_version=self.index.version)
+            except (OSError, ValueError):
+                # store mid-write / unreadable: keep serving the current
+                # index, the stamp still differs so the next check retries
+                return
+            if index is None:
+                # same content, just remember the new stamp
+                self.index.stamp = file_stamp(CANONICAL_FILE)
+            else:
+                self._swap(index)
+        finally:
+            self._reloading = False
+
+    def refresh(self, background: bool = False) -> bool:
+        """
+        Rebuild the index if canonical_keys.json changed on disk.
+
+        The new index is compiled off to the side and swapped in with a
+        single assignment, so rewrite() never sees a half-built state.
+        The phrase cache belongs to the index, so it is dropped as well.
+        With background=True the rebuild runs in a daemon thread.
+        Returns True when a rebuild was started (or done).
+        """
+        self._last_check = time.monotonic()
+
+        if not self._stale():
+            return False
+
+        with self._reload_lock:
+            if self._reloading:
+                return False
+            self._reloading = True
 
-        for canon, variants in self.canonical_map.items():
-            for v in variants:
-                self.match_keys.append((canon, v))
-                self.all_variants.add(self._clean(v))
+        if background:
+            threading.Thread(target=self._reload, daemon=True).start()
+        else:
+            self._reload()
+        return True
 
     
     # PUBLIC ENTRY
     
     def rewrite(self, text: str):
+        if time.monotonic() - self._last_check >= self.reload_interval:
+            self.refresh(background=True)
+
+        index = self.index
         text = self._normalize_text(text)
+        return self._rewrite_normalized(text, index, index.best_match)
 
-        windows = self._generate_windows(text)
-        candidates = self._match_windows(text, windows)
-        accepted = self._resolve_conflicts(candidates)
+
+    def rewrite_many(self, texts, workers: int = -1, chunk_size: int = 64):
+        """
+        Batch version of rewrite().
+
+        Per chunk of `chunk_size` narratives, the distinct delimiter-adjacent
+        phrases are gathered and scored once (VariantIndex.best_matches:
+        memo misses only, `workers` goes to rapidfuzz cdist), then every
+        narrative is rewritten from that shared result, reusing the tokens
+        and windows of the gather pass. The scores fill the phrase memo,
+        so later chunks and rewrite() calls hit it.
+        Chunks are kept small so the gather state dies young: large ones
+        get promoted and pay for full gc passes over the memo.
+        Returns a list with exactly what rewrite() returns for each text.
+        """
+        if time.monotonic() - self._last_check >= self.reload_interval:
+            self.refresh(background=True)
+
+        index = self.index
+        texts = list(texts)
+
+        out = []
+        for k in range(0, len(texts), chunk_size):
+            out.extend(self._rewrite_chunk(texts[k:k + chunk_size], index, workers))
+        return out
+
+    def _rewrite_chunk(self, texts, index, workers):
+        texts = [self._normalize_text(t) for t in texts]
+
+        # windows of the whole chunk in flat lists, narrative k owning
+        # [lo, hi): few containers outlive the gather pass
+        phrases = []
+        win_i, win_j = [], []
+        prepared = []
+        for text in texts:
+            tokens = self._tokenize(text)
+            anchors = self._anchors(text, tokens)
+
+            # known shapes are replayed (see _replay_template)
+            if self.template_cache:
+                runs = self._key_runs(tokens, anchors, index)
+                with index.template_lock:
+                    known = self._shape(tokens, anchors, runs) in index.templates
+                if known:
+                    prepared.append((text, tokens, anchors, None, None))
+                    continue
+
+            joined, offsets = self._joined(tokens)
+            lo = len(phrases)
+            for i, j in self._generate_windows(text, tokens, index, anchors):
+                win_i.append(i)
+                win_j.append(j)
+                phrases.append(joined[offsets[i]:offsets[j + 1]])
+            prepared.append((text, tokens, anchors, lo, len(phrases)))
+
+        resolved = index.best_matches(phrases, workers=workers)
+
+        def lookup(phrase):
+            # a shape evicted since the gather pass was not gathered
+            if phrase in resolved:
+                return resolved[phrase]
+            return index.best_match(phrase)
+
+        out = []
+        for text, tokens, anchors, lo, hi in prepared:
+            candidates = None
+            if lo is not None:
+                candidates = []
+                for k in range(lo, hi):
+                    match = resolved[phrases[k]]
+                    if match:
+                        candidates.append(self._candidate(tokens, win_i[k], win_j[k], match))
+            out.append(self._rewrite_normalized(
+                text, index, lookup, tokens, anchors, candidates
+            ))
+        return out
+
+    def _rewrite_normalized(self, text: str, index, lookup, tokens=None, anchors=None, candidates=None):
+        """
+        `candidates`: the matches of every window, when already scored
+        (see rewrite_many).
+
+        With template_cache on, a narrative whose shape (see _shape) was
+        seen before takes the matches of the windows inside its key runs
+        from the stored plan, and only the windows that reach back past a
+        key run are scored. The output is exactly the uncached one: the
+        plan holds what scoring those windows gives in any narrative of
+        the shape, and conflicts are resolved over the same candidates.
+        """
+        if tokens is None:
+            tokens = self._tokenize(text)
+
+        shape = None
+        accepted = None
+        scan_hitl = True
+        if self.template_cache:
+            if anchors is None:
+                anchors = self._anchors(text, tokens)
+            runs = self._key_runs(tokens, anchors, index)
+            shape = self._shape(tokens, anchors, runs)
+
+            with index.template_lock:
+                if candidates is not None:
+                    template = None
+                    if shape in index.templates:
+                        shape = None
+                else:
+                    template = index.templates.get(shape)
+                    if template is None:
+                        index.template_misses += 1
+                    else:
+                        index.templates.move_to_end(shape)
+                        index.template_hits += 1
+
+            if template is not None:
+                accepted, scan_hitl = self._replay_template(template, tokens, anchors, index)
+                shape = None
+
+        if accepted is None:
+            if candidates is None:
+                windows = self._generate_windows(text, tokens, index, anchors)
+                candidates = self._match_windows(text, windows, tokens, lookup)
+
+            if shape is not None:
+                self._store_template(index, shape, tokens, anchors, runs, candidates)
+
+            accepted = self._resolve_conflicts(candidates)
 
         rewritten_text = self._rewrite_text(text, accepted)
 
-        unknown_hitl = self._collect_unknown_keys_for_hitl(text, windows, accepted)
+        unknown_hitl = None
+        if scan_hitl:
+            unknown_hitl = self._collect_unknown_keys_for_hitl(text, accepted, index)
 
         if unknown_hitl:
             return rewritten_text.upper(), (True, unknown_hitl)
@@ -49,6 +335,155 @@ class KeyDetector:
             return rewritten_text.upper(), False
 
 
+    # TEMPLATE CACHE
+    def _key_runs(self, tokens, anchors, index):
+        """
+        Per delimiter, how many tokens right before it form a word suffix
+        of some variant (the longest such run, at most max_words, never
+        past the previous delimiter); 0 when its last word is in no
+        variant. Everything before a run is a value, whatever its words.
+        """
+        suffixes = index.key_suffixes
+        w = self.max_words or index.max_words
+
+        runs = []
+        prev = -1
+        for j in anchors:
+            key = 0
+            run = tokens[j][0]
+            n = 1
+            # suffixes of suffixes are suffixes: stop at the first miss
+            while run in suffixes:
+                key = n
+                if n == w or j - n == prev:
+                    break
+                run = tokens[j - n][0] + " " + run
+                n += 1
+            runs.append(key)
+            prev = j
+        return runs
+
+    def _shape(self, tokens, anchors, runs):
+        """
+        Shape fingerprint: the key run of every delimiter, values left out.
+
+            orig co name: orig id: desc date: entry descr:
+        """
+        return " ".join(
+            " ".join(t[0] for t in tokens[j - n + 1:j + 1]) + ":"
+            for j, n in zip(anchors, runs)
+        )
+
+    def _store_template(self, index, shape, tokens, anchors, runs, candidates):
+        """
+        Plan of a shape: per delimiter, its key run length and the matches
+        of the windows inside the run, which are the same words in every
+        narrative of the shape. Also kept: how those matches alone resolve,
+        and whether the HITL scan can then report anything.
+        """
+        at = {tokens[j][2]: k for k, j in enumerate(anchors)}
+        inside = [[] for _ in anchors]
+        for c in candidates:
+            k = at[c["end"]]
+            if c["tokens"] <= runs[k]:
+                # (tokens back, variant, score)
+                inside[k].append((c["tokens"], c["canonical"], c["score"]))
+        plans = tuple(zip(runs, map(tuple, inside)))
+
+        # runs do not overlap, so run-only candidates resolve the same way
+        # in every narrative of the shape
+        resolved = tuple(
+            (at[c["end"]], c["tokens"], c["canonical"], c["score"])
+            for c in self._resolve_conflicts(self._plan_candidates(plans, tokens, anchors))
+        )
+
+        # HITL only reports the word right before a delimiter, when it is
+        # unknown and outside every accepted match
+        covered = {k for k, _, _, _ in resolved}
+        scan_hitl = any(
+            k not in covered and (
+                n == 0
+                or (tokens[j][0] not in index.exact and tokens[j][0] not in index.canonical_tokens)
+            )
+            for k, (j, n) in enumerate(zip(anchors, runs))
+        )
+
+        # rewrite_many threads / concurrent parse() calls share the cache
+        with index.template_lock:
+            index.templates[shape] = (scan_hitl, plans, resolved)
+            if len(index.templates) > self.template_cache:
+                index.templates.popitem(last=False)
+
+    def _replay_template(self, template, tokens, anchors, index):
+        """
+        Accepted matches of a narrative of a known shape, and whether the
+        HITL scan is needed. Only the windows that start before a key run
+        (they hold value words) are scored, and only against the variants
+        they can still match; when none of them matches, the candidates
+        are the run matches alone, already resolved in the plan.
+        """
+        scan_hitl, plans, resolved = template
+        joined, offsets = self._joined(tokens)
+        w = self.max_words or index.max_words
+        reach = index.max_reach
+
+        outside = []
+        for (n, _), j in zip(plans, anchors):
+            end = offsets[j + 1]
+            key_start = offsets[j - n + 1]
+            tail = joined[key_start:end]
+
+            for i in range(j - n, max(j - w, -1), -1):
+                # cleaned length only grows further back
+                if end - offsets[i] > reach:
+                    break
+                ids, choices = index.tail_choices(tail, key_start - offsets[i])
+                if not ids:
+                    continue
+                match = index.best_match_among(joined[offsets[i]:end], ids, choices)
+                if match:
+                    outside.append(self._candidate(tokens, i, j, match))
+
+        if not outside:
+            return [
+                self._candidate(tokens, anchors[k] - back + 1, anchors[k], (variant, score))
+                for k, back, variant, score in resolved
+            ], scan_hitl
+
+        candidates = self._plan_candidates(plans, tokens, anchors) + outside
+        # _generate_windows order: start ascending, then length ascending
+        candidates.sort(key=lambda c: (c["start"], c["end"]))
+        return self._resolve_conflicts(candidates), True
+
+    def _plan_candidates(self, plans, tokens, anchors):
+        candidates = [
+            self._candidate(tokens, j - back + 1, j, (variant, score))
+            for (_, inside), j in zip(plans, anchors)
+            for back, variant, score in inside
+        ]
+        candidates.sort(key=lambda c: (c["start"], c["end"]))
+        return candidates
+
+
+    def index_info(self) -> dict:
+        index = self.index
+        return {
+            "version": index.version,
+            "variants": len(index.cleaned),
+            "reload_count": self.reload_count,
+            "last_reload_seconds": self.last_reload_seconds,
+            "reloading": self._reloading,
+        }
+
+
+    def match_stats(self) -> dict:
+        """
+        Exact vs fuzzy tier counters, to see how much fuzzy work remains,
+        plus phrase cache hits / misses / evictions and template hits.
+        """
+        return self.index.stats()
+
+
     
     # NORMALIZATION
     
@@ -66,81 +501,88 @@ class KeyDetector:
     
     # WINDOW GENERATION
     
-    def _generate_windows(self, text: str):
-        tokens = []
-        for m in re.finditer(r"[a-z0-9]+", text):
-            tokens.append((m.group(), m.start(), m.end()))
+    def _tokenize(self, text: str):
+        return [(m.group(), m.start(), m.end()) for m in TOKEN_RE.finditer(text)]
+
+    def _joined(self, tokens):
+        # "".join of tokens[i:j + 1] == joined[offsets[i]:offsets[j + 1]]
+        joined = "".join(t[0] for t in tokens)
+        offsets = [0]
+        for t in tokens:
+            offsets.append(offsets[-1] + len(t[0]))
+        return joined, offsets
+
+    def _anchors(self, text: str, tokens):
+        # indices of tokens followed by a ':'/'=' run
+        delim_ends = {m.start() for m in DELIM_AFTER_RE.finditer(text)}
+        return [j for j, t in enumerate(tokens) if t[2] in delim_ends]
+
+    def _generate_windows(self, text: str, tokens=None, index=None, anchors=None):
+        """
+        Lazily yields (i, j) token spans (inclusive) of at most
+        max_words tokens (the index's longest variant when None) that end
+        right before a ':' / '=' run.
+        Order is start ascending, then length ascending.
 
-        windows = []
+        Spans whose cleaned length is past the index's max_reach cannot
+        score `threshold` against any variant and are not yielded.
+        """
+        if tokens is None:
+            tokens = self._tokenize(text)
+        if anchors is None:
+            anchors = self._anchors(text, tokens)
+
+        index = index or self.index
+        w = self.max_words or index.max_words
+        reach = index.max_reach
+
+        # cleaned length of tokens[i:j + 1] = ends[j] - starts[i]
+        starts, ends = [], []
+        n = 0
+        for t in tokens:
+            starts.append(n)
+            n += len(t[0])
+            ends.append(n)
+
+        k = 0
         for i in range(len(tokens)):
-            for w in range(1, self.max_words + 1):
-                if i + w <= len(tokens):
-                    phrase = " ".join(tokens[j][0] for j in range(i, i + w))
-                    start = tokens[i][1]
-                    end = tokens[i + w - 1][2]
-                    windows.append((phrase, start, end))
-
-        return windows
-
-    
-    # DELIMITER CHECK
-    def _has_delimiter_after(self, text: str, end: int) -> bool:
-        tail = text[end:]
-
-        i = 0
-        while i < len(tail) and tail[i].isspace():
-            i += 1
-
-        # delimiter immediately → OK
-        if i < len(tail) and tail[i] in ":=":
-            return True
-
-        # word continues → NOT a key end
-        if i < len(tail) and tail[i].isalnum():
-            return False
-
-        # skip punctuation, but stop on word
-        while i < len(tail):
-            if tail[i] in ":=":
-                return True
-            if tail[i].isalnum():
-                return False
-            i += 1
-
-        return False
+            while k < len(anchors) and anchors[k] < i:
+                k += 1
+            for j in anchors[k:k + w]:
+                if j - i >= w or ends[j] - starts[i] > reach:
+                    break
+                yield i, j
 
     
     # MATCH WINDOWS AGAINST CANONICAL VARIANTS
-    def _match_windows(self, text, windows):
+    def _match_windows(self, text, windows, tokens=None, lookup=None):
+        if tokens is None:
+            tokens = self._tokenize(text)
+        if lookup is None:
+            lookup = self.index.best_match
+
+        joined, offsets = self._joined(tokens)
         candidates = []
 
-        for phrase, start, end in windows:
-            if not self._has_delimiter_after(text, end):
-                continue
+        for i, j in windows:
+            match = lookup(joined[offsets[i]:offsets[j + 1]])
 
-            phrase_clean = self._clean(phrase)
-
-            best_canon = None
-            best_score = 0
-
-            for canon, variant in self.match_keys:
-                score = fuzz.ratio(phrase_clean, self._clean(variant))
-                if score >= self.threshold and score > best_score:
-                    best_canon = variant
-                    best_score = score
-
-            if best_canon:
-                candidates.append({
-                    "raw": phrase,
-                    "canonical": best_canon,   
-                    "score": best_score,
-                    "start": start,
-                    "end": end,
-                    "tokens": len(phrase.split())
-                })
+            if match:
+                candidates.append(self._candidate(tokens, i, j, match))
         # print(json.dumps(candidates,indent=3))
         return candidates
 
+    def _candidate(self, tokens, i, j, match):
+        best_canon, best_score = match
+        return {
+            "raw": " ".join(t[0] for t in tokens[i:j + 1]),
+            "canonical": best_canon,
+            "score": best_score,
+            "start": tokens[i][1],
+            "end": tokens[j][2],
+            "tokens": j - i + 1
+        }
+
 
 
     
@@ -155,38 +597,27 @@ class KeyDetector:
         # sort by start position only (grouping purpose)
         candidates.sort(key=lambda c: c["start"])
 
+        # Sweep line: accepted stays sorted and non-overlapping, and every
+        # accepted start is <= c["start"], so only the last accepted
+        # candidate can overlap c.
         accepted = []
 
         for c in candidates:
-            keep = True
-
-            for a in accepted[:]:
-                overlap = not (c["end"] <= a["start"] or c["start"] >= a["end"])
-
-                if not overlap:
-                    continue
+            if accepted and c["start"] < accepted[-1]["end"]:
+                a = accepted[-1]
 
                 # -------- conflict detected --------
 
                 # Rule 1: higher score wins
-                if c["score"] > a["score"]:
-                    accepted.remove(a)
-                    continue
-
-                if c["score"] < a["score"]:
-                    keep = False
-                    break
-
                 # Rule 2: score tie → more tokens wins
-                if c["tokens"] > a["tokens"]:
-                    accepted.remove(a)
-                    continue
+                if c["score"] > a["score"] or (
+                    c["score"] == a["score"] and c["tokens"] > a["tokens"]
+                ):
+                    accepted.pop()
                 else:
-                    keep = False
-                    break
+                    continue
 
-            if keep:
-                accepted.append(c)
+            accepted.append(c)
 
         # optional debug
         # print(json.dumps(accepted, indent=2))
@@ -199,78 +630,67 @@ class KeyDetector:
     # REWRITE TEXT
     
     def _rewrite_text(self, text: str, accepted):
-        accepted.sort(key=lambda c: c["start"], reverse=True)
+        accepted.sort(key=lambda c: c["start"])
 
+        out = []
+        pos = 0
         for c in accepted:
-            text = text[:c["start"]] + c["canonical"] + text[c["end"]:]
+            out.append(text[pos:c["start"]])
+            out.append(c["canonical"])
+            pos = c["end"]
+        out.append(text[pos:])
 
-        return text
+        return "".join(out)
 
     
-    # HITL — AMBIGUOUS MATCHES
+    # HITL — SUGGESTIONS
     
-    def _collect_hitl(self, candidates, accepted, text):
-        accepted_spans = [(a["start"], a["end"]) for a in accepted]
-        hitl = []
-
-        for phrase, start, end in self._generate_windows(text):
-            # must be followed by delimiter
-            if not self._has_delimiter_after(text, end):
-                continue
-
-            # ignore single-word junk
-            if len(phrase.split()) < 2:
-                continue
-
-            # ignore non-alpha phrases
-            if not re.search(r"[a-z]", phrase):
-                continue
-
-            # ignore if fully inside accepted key
-            inside = False
-            for a_start, a_end in accepted_spans:
-                if start >= a_start and end <= a_end:
-                    inside = True
-                    break
-            if inside:
-                continue
-
-            # check if this phrase matched ANY canonical key
-            matched = False
-            phrase_clean = self._clean(phrase)
+    def suggest(self, variant_lists, k: int = 3):
+        """
+        Nearest canonical keys for unknown-key records, off the rewrite
+        path (see HitlCapture): one [{"canonical", "score"}, ...] per
+        list of variants, best first, a canonical scoring by its best
+        variant. Uses the live index, whole vocabulary.
+        """
+        index = self.index
 
-            for _, variant in self.match_keys:
-                if fuzz.ratio(phrase_clean, self._clean(variant)) >= self.threshold:
-                    matched = True
-                    break
+        phrases = sorted({self._clean(v.lower()) for vs in variant_lists for v in vs} - {""})
+        rows = dict(zip(phrases, index.suggestions(phrases, k=k)))
 
-            if matched:
-                continue
+        out = []
+        for vs in variant_lists:
+            # a canonical in the top k of the best variant scores is in
+            # the top k of the variant that gives its best score
+            best = {}
+            for v in vs:
+                for canon, score in rows.get(self._clean(v.lower()), ()):
+                    if score > best.get(canon, 0):
+                        best[canon] = score
 
-            # REAL HITL CASE
-            hitl.append({
-                "type": "NEW_KEY",
-                "raw_phrase": phrase.upper(),
-                "suggested": None,
-                "confidence": None
-            })
+            ranked = sorted(best.items(), key=lambda x: -x[1])[:k]
+            out.append([{"canonical": c, "score": sc} for c, sc in ranked])
 
-        return hitl
+        return out
 
 
     
     # HITL — COMPLETELY UNKNOWN KEYS
     
-    def _collect_unknown_keys_for_hitl(self, text, windows, accepted):
-        accepted_spans = [(a["start"], a["end"]) for a in accepted]
+    def _collect_unknown_keys_for_hitl(self, text, accepted, index=None):
+        index = index or self.index
+
+        # accepted is sorted and non-overlapping (see _resolve_conflicts)
+        spans = sorted((a["start"], a["end"]) for a in accepted)
+        starts = [a_start for a_start, _ in spans]
         hitl = {}
 
-        # all canonical words flattened (for NAME vs CUST NAME)
-        canonical_tokens = set()
-        for v in self.all_variants:
-            canonical_tokens.update(re.findall(r"[a-z]+", v))
+        # all canonical words flattened (for NAME vs CUST NAME), built at load
+        canonical_tokens = index.canonical_tokens
 
-        for m in re.finditer(r"\b([a-z][a-z0-9]*)\s*[:=]", text):
+        words = None
+        word_at = None
+
+        for m in HITL_KEY_RE.finditer(text):
             key_start, key_end = m.span(1)
             raw_key = m.group(1)
 
@@ -281,27 +701,22 @@ class KeyDetector:
             clean_key = self._clean(raw_key)
 
             # ❌ already known or part of known key
-            if clean_key in self.all_variants:
+            if clean_key in index.exact:
                 continue
             if raw_key in canonical_tokens:
                 continue
 
             # ❌ overlaps accepted canonical match
-            overlap = False
-            for a_start, a_end in accepted_spans:
-                if not (key_end <= a_start or key_start >= a_end):
-                    overlap = True
-                    break
-            if overlap:
+            k = bisect_left(starts, key_end) - 1
+            if k >= 0 and spans[k][1] > key_start:
                 continue
 
-            # tokenize safely
-            words = list(re.finditer(r"[a-z0-9]+|[:=]", text))
-            idx = None
-            for i, w in enumerate(words):
-                if w.start() == key_start:
-                    idx = i
-                    break
+            # tokenize once per narrative, only when a key survives
+            if words is None:
+                words = list(WORD_RE.finditer(text))
+                word_at = {w.start(): i for i, w in enumerate(words)}
+
+            idx = word_at.get(key_start)
             if idx is None:
                 continue
 
@@ -332,6 +747,10 @@ class KeyDetector:
 
 
 if __name__=='__main__':
+    if sys.argv[1:] == ["--build-snapshot"]:
+        print(f"snapshot written for store {build_snapshot()}")
+        sys.exit(0)
+
     kd = KeyDetector()
     rewritten, hitl = kd.rewrite(
     "TRANS TYPE = CCD SENDING CO NAME = APPLIED SYSTEMS COMPANY ID = 8263863381")
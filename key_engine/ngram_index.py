@@ -0,0 +1,104 @@
+from collections import Counter
+
+import numpy as np
+
+
+def grams(s: str, q: int = 2):
+    return [s[i:i + q] for i in range(len(s) - q + 1)]
+
+
+class NgramIndex:
+    """
+    q-gram inverted index over cleaned variants, used only to generate
+    candidates; fuzz.ratio still confirms every hit.
+
+    fuzz.ratio(a, b) >= t needs LCS(a, b) >= L = t * (n + m) / 200.
+    Every char deleted from a breaks at most q of a's q-grams, every char
+    inserted on the way to b breaks at most q - 1, so a and b share at least
+
+        (n - q + 1) - q * (n - L) - (q - 1) * (m - L)
+
+    q-grams (multiset). Variants below that count cannot reach the
+    threshold and are never scored. Only the postings of the phrase's own
+    q-grams are touched, and they are summed in numpy.
+    """
+
+    def __init__(self, cleaned, threshold, reachable, q: int = 2):
+        self.q = q
+        self.threshold = threshold
+        # (n, m) -> bool, the length bound of the owning VariantIndex
+        self.reachable = reachable
+        self.size = len(cleaned)
+        self.lengths = [len(c) for c in cleaned]
+
+        # q-gram -> levels, levels[j] = ids of variants holding that
+        # q-gram more than j times; min(count, k) shared grams is then
+        # one entry per id in levels[:k]
+        postings = {}
+        for i, c in enumerate(cleaned):
+            for g, k in Counter(grams(c, q)).items():
+                levels = postings.setdefault(g, [])
+                for j in range(k):
+                    if j == len(levels):
+                        levels.append([])
+                    levels[j].append(i)
+
+        self.postings = {
+            g: [np.array(ids, dtype=np.intp) for ids in levels]
+            for g, levels in postings.items()
+        }
+
+        # phrase length -> (per-variant required shared q-grams, sorted
+        # ids of the variants that need none)
+        self._need = {}
+
+    def required(self, n: int, m: int) -> int:
+        # floor keeps the bound conservative against float rounding
+        lcs = int(self.threshold * (n + m) // 200)
+        q = self.q
+        return max(
+            (n - q + 1) - q * (n - lcs) - (q - 1) * (m - lcs),
+            (m - q + 1) - q * (m - lcs) - (q - 1) * (n - lcs),
+        )
+
+    def _need_for(self, n: int):
+        hit = self._need.get(n)
+        if hit is None:
+            by_len = {}
+            for m in set(self.lengths):
+                # unreachable lengths can never qualify
+                by_len[m] = self.required(n, m) if self.reachable(n, m) else np.inf
+            need = np.array([by_len[m] for m in self.lengths], dtype=np.float64)
+            hit = (need, np.flatnonzero(need <= 0))
+            self._need[n] = hit
+        return hit
+
+    def candidates(self, phrase: str):
+        """
+        Sorted ids of variants that may score >= threshold against `phrase`.
+        """
+        need, free = self._need_for(len(phrase))
+
+        ids = []
+        for g, k in Counter(grams(phrase, self.q)).items():
+            levels = self.postings.get(g)
+            if levels is not None:
+                ids.extend(levels[:k])
+
+        if not ids:
+            # only variants that need no shared q-gram at all
+            return free.tolist()
+
+        ids = np.concatenate(ids)
+        if len(ids) * 16 + 4096 < self.size:
+            # few postings in a large vocabulary: count the touched ids
+            # only. np.unique sorts, so past that a bincount over every
+            # id is cheaper (common q-grams touch most of the vocabulary)
+            touched, shared = np.unique(ids, return_counts=True)
+            hit = touched[shared >= need[touched]]
+            if len(free):
+                hit = np.union1d(hit, free)
+            return hit.tolist()
+
+        shared = np.bincount(ids, minlength=self.size)
+        return np.flatnonzero(shared >= need).tolist()
@@ -0,0 +1,57 @@
+"""
+Store files that running processes reload when they change on disk
+(canonical_keys.json, the parsers' keys.json) and the files written
+next to them (index snapshot, HITL store).
+"""
+import json
+import os
+import threading
+
+
+def file_stamp(path):
+    """
+    (mtime_ns, size) of `path`, None when it cannot be stat'ed.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def file_changed(path, stamp) -> bool:
+    """
+    True when `path` exists and its stamp is no longer `stamp`.
+    """
+    now = file_stamp(path)
+    return now is not None and now != stamp
+
+
+def read_stamped(path, read):
+    """
+    (stamp, read()) for `path`. The stamp is taken first, so a write
+    racing the read leaves it stale and the next file_changed() check
+    reads again. The caller publishes the result with a single
+    attribute store: in-flight users keep the object they took.
+    """
+    stamp = file_stamp(path)
+    return stamp, read()
+
+
+def write_atomic(path, dump, binary: bool = False) -> None:
+    """
+    Writes `path` through dump(f) to a temp file renamed over it:
+    readers see the old file or the new one, never a partial write.
+    """
+    tmp = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+    if binary:
+        f = open(tmp, "wb")
+    else:
+        f = open(tmp, "w", encoding="utf-8")
+    with f:
+        dump(f)
+    os.replace(tmp, path)
+
+
+def write_json_atomic(path, data) -> None:
+    write_atomic(path, lambda f: json.dump(data, f, indent=2))
@@ -0,0 +1,516 @@
+import pickle
+import re
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import LCSseq
+
+from key_engine.ngram_index import NgramIndex
+from key_engine.store_file import write_atomic
+
+
+# fuzzy candidate generation: length buckets, or q-gram inverted index
+ENGINES = ("bulk", "ngram")
+
+# phrase not in the memo (None is a memoised "no match")
+_MISSING = object()
+
+# bump when the compiled layout changes, old snapshots are then ignored
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_FIELDS = (
+    "cleaned", "variants", "canons", "match_keys",
+    "max_words", "exact", "canonical_tokens", "buckets",
+)
+
+
+def clean(s: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", s)
+
+
+def write_snapshot(index: "VariantIndex", path) -> None:
+    snap = index.snapshot()
+    write_atomic(
+        path,
+        lambda f: pickle.dump(snap, f, protocol=pickle.HIGHEST_PROTOCOL),
+        binary=True
+    )
+
+
+def load_snapshot(path, version: str):
+    """
+    Returns the snapshot dict if it was built from store `version`,
+    otherwise None (missing, stale or unreadable -> caller uses the JSON).
+    """
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except Exception:
+        # truncated, foreign or corrupt pickle: any unpickling error
+        return None
+
+    if not isinstance(data, dict):
+        return None
+    if data.get("format") != SNAPSHOT_FORMAT or data.get("version") != version:
+        return None
+    return data
+
+
+class VariantIndex:
+    """
+    Precomputed view of the canonical variants used for fuzzy matching.
+
+    - variants are cleaned once and deduplicated (first occurrence wins,
+      exactly like the old first-best scan over match_keys)
+    - exact tier: a cleaned phrase equal to a variant resolves in O(1)
+      with score 100, no fuzzy scoring at all
+    - cleaned variants are grouped by length
+    - for a phrase of length n only the buckets that can still reach
+      `threshold` are scored, through rapidfuzz's bulk scorer
+    - fuzzy results (including "no match") are memoised per cleaned
+      phrase in a bounded LRU; the cache lives and dies with the index,
+      so rebuilding the index after a store change invalidates it
+    - engine="ngram" replaces the per-length scan with candidates from a
+      q-gram inverted index (see NgramIndex); same results. "bulk" stays
+      faster below about 2k variants (benchmarks/bench_candidates.py)
+    """
+
+    def __init__(
+        self,
+        match_keys,
+        threshold: int = 85,
+        cache_size: int = 100_000,
+        version: str | None = None,
+        engine: str = "bulk"
+    ):
+        self.cleaned = []
+        self.variants = []
+        self.canons = []
+
+        seen = set()
+        for canon, variant in match_keys:
+            c = clean(variant)
+            if c in seen:
+                continue
+            seen.add(c)
+            self.cleaned.append(c)
+            self.variants.append(variant)
+            self.canons.append(canon)
+
+        # (canon, variant) pairs, deduplicated, in canonical_keys.json order
+        self.match_keys = list(zip(self.canons, self.variants))
+
+        # longest variant, in words
+        self.max_words = max(
+            (len(re.findall(r"[a-z0-9]+", v)) for v in self.variants),
+            default=1
+        )
+
+        # exact tier: cleaned variant -> id
+        self.exact = {c: i for i, c in enumerate(self.cleaned)}
+
+        # letter runs of cleaned variants (HITL: NAME vs CUST NAME)
+        self.canonical_tokens = set()
+        for c in self.cleaned:
+            self.canonical_tokens.update(re.findall(r"[a-z]+", c))
+
+        # length -> ids (in vocabulary order)
+        self.buckets = {}
+        for i, c in enumerate(self.cleaned):
+            self.buckets.setdefault(len(c), []).append(i)
+
+        self._init_runtime(threshold, cache_size, version, engine)
+
+    def _init_runtime(self, threshold, cache_size, version, engine="bulk"):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+
+        self.threshold = threshold
+        self.engine = engine
+        # longest cleaned phrase that can still reach `threshold`
+        # against the longest variant (see _reachable)
+        longest = max(self.buckets, default=0)
+        self.max_reach = longest * (200 - threshold) // threshold
+        # built on first fuzzy lookup with engine="ngram"
+        self._ngram = None
+        # content hash of the store this index was built from
+        self.version = version
+        self.stamp = None
+        self.build_seconds = None
+
+        # phrase length -> (ids, cleaned strings) worth scoring
+        self._choices = {}
+
+        # tier counters
+        self.exact_hits = 0
+        self.fuzzy_lookups = 0
+        self.fuzzy_hits = 0
+
+        # cleaned phrase -> (id, score) | None, least recently used first;
+        # cache_size None = unbounded, 0 = off
+        self.cache_size = cache_size
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+
+        # word suffixes of the variants as written ("co name", "name" for
+        # "sending co name"): the key words template shapes keep
+        self.key_suffixes = set()
+        for v in self.variants:
+            words = re.findall(r"[a-z0-9]+", v.lower())
+            self.key_suffixes.update(" ".join(words[k:]) for k in range(len(words)))
+
+        # narrative shape -> rewrite plan, filled by KeyDetector
+        self.templates = OrderedDict()
+        self.template_lock = threading.Lock()
+        self.template_hits = 0
+        self.template_misses = 0
+        # key run -> {variant id: LCS(run, variant[s:]) per split s}, and
+        # (key run, value chars) -> (ids, choices), see tail_choices
+        self._tail_lcs = {}
+        self._tail_choices = {}
+
+        # canonical names, variant ids grouped by canonical and group
+        # starts, built on the first suggestions() call
+        self._canon_names = None
+        self._canon_order = None
+        self._canon_starts = None
+
+
+    # SNAPSHOT
+    def snapshot(self) -> dict:
+        """
+        Threshold-independent compiled state, for write_snapshot().
+        """
+        data = {f: getattr(self, f) for f in SNAPSHOT_FIELDS}
+        data["format"] = SNAPSHOT_FORMAT
+        data["version"] = self.version
+        return data
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        data: dict,
+        threshold: int = 85,
+        cache_size: int = 100_000,
+        engine: str = "bulk"
+    ):
+        index = cls.__new__(cls)
+        for f in SNAPSHOT_FIELDS:
+            setattr(index, f, data[f])
+        index._init_runtime(threshold, cache_size, data["version"], engine)
+        return index
+
+
+    # LENGTH PRUNING
+    def _reachable(self, n: int, m: int) -> bool:
+        # fuzz.ratio <= 100 * 2 * min(n, m) / (n + m)
+        return 200 * min(n, m) >= self.threshold * (n + m)
+
+    def choices_for(self, n: int):
+        hit = self._choices.get(n)
+        if hit is not None:
+            return hit
+
+        ids = []
+        for m, bucket in self.buckets.items():
+            if self._reachable(n, m):
+                ids.extend(bucket)
+        ids.sort()
+
+        hit = (ids, [self.cleaned[i] for i in ids])
+        self._choices[n] = hit
+        return hit
+
+
+    def ngram_choices(self, phrase_clean: str):
+        if self._ngram is None:
+            self._ngram = NgramIndex(self.cleaned, self.threshold, self._reachable)
+
+        ids = self._ngram.candidates(phrase_clean)
+        return ids, [self.cleaned[i] for i in ids]
+
+
+    # BEST MATCH
+    def best_match(self, phrase_clean: str):
+        """
+        Returns (variant, score) for the best scoring variant, or None.
+        Ties keep the earliest variant in canonical_keys.json order.
+        """
+        i = self.exact.get(phrase_clean)
+        if i is not None and self.threshold <= 100:
+            self.exact_hits += 1
+            return self.variants[i], 100.0
+
+        self.fuzzy_lookups += 1
+
+        res = self._memo_get(phrase_clean)
+        if res is _MISSING:
+            self.cache_misses += 1
+            res = self._fuzzy_best(phrase_clean)
+            self._memo_put(phrase_clean, res)
+        else:
+            self.cache_hits += 1
+
+        if res is None:
+            return None
+
+        self.fuzzy_hits += 1
+        return self.variants[res[0]], res[1]
+
+    def _fuzzy_best(self, phrase_clean: str):
+        if self.engine == "ngram":
+            ids, choices = self.ngram_choices(phrase_clean)
+        else:
+            ids, choices = self.choices_for(len(phrase_clean))
+        if not choices:
+            return None
+
+        res = process.extractOne(
+            phrase_clean,
+            choices,
+            scorer=fuzz.ratio,
+            score_cutoff=self.threshold
+        )
+        if res is None or res[1] <= 0:
+            return None
+
+        return ids[res[2]], res[1]
+
+
+    # PHRASE MEMO
+    def _memo_get(self, phrase_clean: str):
+        # rewrite() / rewrite_many() callers may share the index
+        with self._memo_lock:
+            res = self._memo.get(phrase_clean, _MISSING)
+            if res is not _MISSING:
+                self._memo.move_to_end(phrase_clean)
+        return res
+
+    def _memo_put(self, phrase_clean: str, res) -> None:
+        with self._memo_lock:
+            self._memo_insert(phrase_clean, res)
+
+    def _memo_insert(self, phrase_clean: str, res) -> None:
+        # caller holds _memo_lock
+        if self.cache_size == 0:
+            return
+        self._memo[phrase_clean] = res
+        if self.cache_size is not None and len(self._memo) > self.cache_size:
+            self._memo.popitem(last=False)
+            self.cache_evictions += 1
+
+
+    # TEMPLATE WINDOWS
+    def tail_choices(self, tail: str, head: int):
+        """
+        (ids, cleaned strings) of the variants that a cleaned phrase of
+        `head` unknown chars followed by `tail` can score `threshold`
+        against, whatever the head; the others are never scored.
+
+        fuzz.ratio is 200 * LCS / (n + m), and the head can match at most
+        min(head, s) chars of variant[:s], so for a split s the LCS is at
+        most min(head, s) + LCS(tail, variant[s:]).
+        """
+        key = (tail, head)
+        hit = self._tail_choices.get(key)
+        if hit is not None:
+            return hit
+
+        rows = self._tail_lcs.setdefault(tail, {})
+        n = head + len(tail)
+
+        ids = []
+        for i in self.choices_for(n)[0]:
+            row = rows.get(i)
+            if row is None:
+                c = self.cleaned[i]
+                row = [LCSseq.similarity(tail, c[s:]) for s in range(len(c) + 1)]
+                rows[i] = row
+
+            lcs = max(min(head, s) + x for s, x in enumerate(row))
+            if 200 * lcs >= self.threshold * (n + len(row) - 1):
+                ids.append(i)
+
+        hit = (ids, [self.cleaned[i] for i in ids])
+        self._tail_choices[key] = hit
+        return hit
+
+    def best_match_among(self, phrase_clean: str, ids, choices):
+        """
+        best_match() scoring only `choices`, which must hold every variant
+        the phrase can reach `threshold` against (see tail_choices). Not
+        memoised: these phrases hold value words.
+        """
+        i = self.exact.get(phrase_clean)
+        if i is not None and self.threshold <= 100:
+            self.exact_hits += 1
+            return self.variants[i], 100.0
+
+        self.fuzzy_lookups += 1
+
+        res = process.extractOne(
+            phrase_clean,
+            choices,
+            scorer=fuzz.ratio,
+            score_cutoff=self.threshold
+        )
+        if res is None or res[1] <= 0:
+            return None
+
+        self.fuzzy_hits += 1
+        return self.variants[ids[res[2]]], res[1]
+
+
+    # BATCH MATCH
+    def best_matches(self, phrases, workers: int = -1, chunk_size: int = 4096):
+        """
+        best_match() for many cleaned phrases at once, repeats allowed.
+        Returns {phrase: (variant, score) | None}.
+
+        Distinct fuzzy phrases missing from the memo are scored per length
+        bucket with process.cdist (`workers` is passed through); argmax
+        keeps the first best column, i.e. the same tie rule as extractOne.
+        The results go into the memo. Every occurrence is counted in the
+        tiers and the cache stats as best_match() would count it.
+        """
+        counts = Counter(phrases)
+        out = {}
+        by_len = {}
+
+        # one pass under the memo lock, as _memo_get would do per phrase
+        with self._memo_lock:
+            memo = self._memo
+            for p, c in counts.items():
+                i = self.exact.get(p)
+                if i is not None and self.threshold <= 100:
+                    self.exact_hits += c
+                    out[p] = (self.variants[i], 100.0)
+                    continue
+
+                self.fuzzy_lookups += c
+                res = memo.get(p, _MISSING)
+                if res is _MISSING:
+                    # the first occurrence misses, the repeats would hit
+                    self.cache_misses += 1
+                    self.cache_hits += c - 1
+                    by_len.setdefault(len(p), []).append(p)
+                    continue
+
+                memo.move_to_end(p)
+                self.cache_hits += c
+                if res is None:
+                    out[p] = None
+                else:
+                    self.fuzzy_hits += c
+                    out[p] = (self.variants[res[0]], res[1])
+
+        for n, group in by_len.items():
+            ids, choices = self.choices_for(n)
+            if choices:
+                scored = self._score_bulk(group, ids, choices, workers, chunk_size)
+            else:
+                scored = [None] * len(group)
+
+            with self._memo_lock:
+                for p, res in zip(group, scored):
+                    self._memo_insert(p, res)
+
+            for p, res in zip(group, scored):
+                if res is None:
+                    out[p] = None
+                else:
+                    self.fuzzy_hits += counts[p]
+                    out[p] = (self.variants[res[0]], res[1])
+
+        return out
+
+
+    def _score_bulk(self, group, ids, choices, workers, chunk_size):
+        scored = []
+        for k in range(0, len(group), chunk_size):
+            part = group[k:k + chunk_size]
+            scores = process.cdist(
+                part,
+                choices,
+                scorer=fuzz.ratio,
+                score_cutoff=self.threshold,
+                dtype=np.float64,
+                workers=workers
+            )
+            best = scores.argmax(axis=1)
+            top = scores[np.arange(len(part)), best]
+
+            for b, score in zip(best.tolist(), top.tolist()):
+                scored.append((ids[b], score) if score > 0 else None)
+        return scored
+
+
+    # HITL SUGGESTIONS
+    def suggestions(self, phrases, k: int = 3, workers: int = -1, chunk_size: int = 1024):
+        """
+        Nearest canonical keys for cleaned phrases, no threshold.
+        Returns one [(canonical, score), ...] per phrase, best first,
+        a canonical scoring by its best variant. Ties keep canonical
+        order.
+
+        Meant for aggregated HITL records, not the rewrite path: every
+        phrase is scored against the whole vocabulary.
+        """
+        if self._canon_names is None:
+            names = list(dict.fromkeys(self.canons))
+            pos = {c: n for n, c in enumerate(names)}
+            ids = np.array([pos[c] for c in self.canons], dtype=np.intp)
+            self._canon_order = np.argsort(ids, kind="stable")
+            self._canon_starts = np.searchsorted(ids[self._canon_order], np.arange(len(names)))
+            self._canon_names = names
+
+        names = self._canon_names
+        if not phrases or not names:
+            return [[] for _ in phrases]
+
+        out = []
+        for lo in range(0, len(phrases), chunk_size):
+            part = phrases[lo:lo + chunk_size]
+            scores = process.cdist(
+                part,
+                self.cleaned,
+                scorer=fuzz.ratio,
+                dtype=np.float64,
+                workers=workers
+            )
+
+            # best variant per canonical
+            best = np.maximum.reduceat(
+                scores[:, self._canon_order], self._canon_starts, axis=1
+            )
+
+            top = np.argsort(-best, axis=1, kind="stable")[:, :k]
+            for row, cols in zip(best, top):
+                out.append([(names[c], float(row[c])) for c in cols if row[c] > 0])
+
+        return out
+
+
+    # TIER STATS
+    def stats(self) -> dict:
+        lookups = self.exact_hits + self.fuzzy_lookups
+        return {
+            "lookups": lookups,
+            "exact_hits": self.exact_hits,
+            "fuzzy_lookups": self.fuzzy_lookups,
+            "fuzzy_hits": self.fuzzy_hits,
+            "exact_hit_rate": self.exact_hits / lookups if lookups else 0.0,
+            "fuzzy_rate": self.fuzzy_lookups / lookups if lookups else 0.0,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_evictions": self.cache_evictions,
+            "cache_size": len(self._memo),
+            "cache_max_size": self.cache_size,
+            "template_hits": self.template_hits,
+            "template_misses": self.template_misses,
+            "templates": len(self.templates),
+        }
@@ -1,18 +1,15 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line: return ""
-    line = re.sub(r"^[,\|]+", "", line)
-    line = re.sub(r"[,\|\\]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges")
 
 AVIDPAY_CHECK_RECOGNISE_RE = re.compile(
     r"(?:^|[\s\-])AVIDPAY(?!.*\bACH\b).*REF\*?CK\*?\d+\*",
 )
 
 
-def is_avidpay_check(line: str) -> bool:
+def is_avidpay_check(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -46,7 +43,7 @@ AVIDPAY_CHECK_CCD_PARSE_RE = re.compile(
 )
 
 
-def parse_avidpay_check(line: str) -> dict:
+def parse_avidpay_check(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     # Variant 1: backslash-delimited (existing one)
@@ -1,19 +1,15 @@
 import re
 from .avidp_check_parser import is_avidpay_check
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"[,\s]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma_tail")
 
 AVIDPAY_GENERIC_RECOGNISE_RE = re.compile(
     r"\bAVIDPAY\b\s+REFCK\d+\*.+$"
 )
 
-def is_avidpay_generic(line: str) -> bool:
+def is_avidpay_generic(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -37,7 +33,7 @@ AVIDPAY_GENERIC_PARSE_RE = re.compile(
     re.VERBOSE
 )
 
-def parse_avidpay_generic(line: str) -> dict:
+def parse_avidpay_generic(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     m = AVIDPAY_GENERIC_PARSE_RE.search(norm)
@@ -0,0 +1,6 @@
+from collections import namedtuple
+
+# what recognition found, handed to the routed parser so it does not
+# recognize again: format name, sub-pattern (spanish pattern number,
+# PayPal class) and the recognizer's re.Match, when there are any
+Detection = namedtuple("Detection", "format pattern match", defaults=(None, None))
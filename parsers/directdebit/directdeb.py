@@ -1,12 +1,8 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = re.sub(r"^[,|]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges")
 
 DIRECT_DEBIT_RE = re.compile(
     r"""
@@ -43,7 +39,7 @@ DIRECT_DEBIT_EXCLUDE_RE = re.compile(
     re.VERBOSE
 )
 
-def is_direct_debit(line: str) -> bool:
+def is_direct_debit(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -55,7 +51,7 @@ def is_direct_debit(line: str) -> bool:
 
 REF_RE = re.compile(r"\b[A-Z0-9\-]{6,}\b")
 
-def parse_direct_debit(line: str) -> dict:
+def parse_direct_debit(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     tokens = norm.split()
@@ -1,14 +1,11 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
 # ---------------------------------------------------------
 # 1. Normalization (run ONCE before any recognition/parsing)
 # ---------------------------------------------------------
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma")
 
 
 # ---------------------------------------------------------
@@ -20,7 +17,7 @@ DISBURSEMENT_RECOGNISE_RE = re.compile(
 
 
 
-def is_disbursement_narrative(line: str) -> bool:
+def is_disbursement_narrative(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -51,7 +48,7 @@ DISBURSEMENT_PARSE_RE = re.compile(
     re.VERBOSE
 )
 
-def parse_disbursement_narrative(line: str) -> dict:
+def parse_disbursement_narrative(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     m = DISBURSEMENT_PARSE_RE.search(norm)
@@ -1,14 +1,11 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
 # ---------------------------------------------------------
 # 1. NORMALIZATION (shared across all parsers)
 # ---------------------------------------------------------
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma")
 
 
 # ---------------------------------------------------------
@@ -24,7 +21,7 @@ FUNDS_TRANSFER_FRMDEP_RECOGNISE_RE = re.compile(
 )
 
 
-def is_funds_transfer_frmdep(line: str) -> bool:
+def is_funds_transfer_frmdep(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -53,7 +50,7 @@ FUNDS_TRANSFER_FRMDEP_PARSE_RE = re.compile(
 # ---------------------------------------------------------
 # 4. PARSER (FACTS ONLY — NO PAYER/PAYEE)
 # ---------------------------------------------------------
-def parse_funds_transfer_frmdep(line: str) -> dict:
+def parse_funds_transfer_frmdep(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     match = FUNDS_TRANSFER_FRMDEP_PARSE_RE.search(norm)
@@ -0,0 +1,386 @@
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from collections.abc import Mapping
+
+
+class KeyMatcher:
+    """
+    Aho-Corasick automaton over a key list, shared by the key parsers
+    (ach / wire / swift / all).
+
+    find() returns exactly what the old per-key find_keys scan did (see
+    benchmarks/bench_find_keys.py):
+    - keys are taken in list order (the parsers sort longest first),
+      occurrences left to right
+    - a hit must be standalone: the chars around it are in `allowed`
+      (text start / end count as ' ')
+    - a hit is dropped when it starts inside an earlier accepted hit
+
+    The text is walked once for all keys instead of once per key.
+    """
+
+    def __init__(self, keys, allowed):
+        self.keys = list(keys)
+        self.allowed = frozenset(allowed)
+
+        # trie: state -> {char: state}, plus key ids ending in each state
+        self.goto = [{}]
+        self.out = [[]]
+        for p, k in enumerate(self.keys):
+            s = 0
+            for ch in k:
+                nxt = self.goto[s].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[s][ch] = nxt
+                    self.goto.append({})
+                    self.out.append([])
+                s = nxt
+            self.out[s].append(p)
+
+        # failure links, breadth first
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            s = queue.popleft()
+            for ch, nxt in self.goto[s].items():
+                f = self.fail[s]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+                queue.append(nxt)
+
+    def occurrences(self, text: str):
+        """
+        Yields (start, key id) for every occurrence of every key,
+        standalone or not.
+        """
+        goto, fail, out, keys = self.goto, self.fail, self.out, self.keys
+        s = 0
+        for pos, ch in enumerate(text):
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            for p in out[s]:
+                yield pos - len(keys[p]) + 1, p
+
+    def find(self, text: str) -> dict:
+        """
+        {start: key} of non-overlapping standalone keys, by position.
+        """
+        return self.select(text, self.occurrences(text), 0, len(text))
+
+    def select(self, text: str, occurrences, lo: int, hi: int) -> dict:
+        """
+        find() over text[lo:hi] without slicing it: `occurrences` are
+        (start, key id) in full-text offsets, hits not inside the span
+        are ignored and the span edges count as text start / end.
+        """
+        allowed = self.allowed
+        keys = self.keys
+
+        hits = []
+        for i, p in occurrences:
+            end = i + len(keys[p])
+            if i < lo or end > hi:
+                continue
+            before = text[i - 1] if i > lo else ' '
+            after = text[end] if end < hi else ' '
+            if before in allowed and after in allowed:
+                hits.append((p, i))
+
+        # key list order first, then left to right
+        hits.sort()
+
+        found = {}
+        reserved = []
+        for p, i in hits:
+            if any(s <= i < e for s, e in reserved):
+                continue
+            k = keys[p]
+            found[i] = k
+            reserved.append((i, i + len(k)))
+
+        return dict(sorted(found.items()))
+
+
+def _strip(text: str, lo: int, hi: int):
+    # bounds of text[lo:hi].strip(), without building the slice
+    while lo < hi and text[lo].isspace():
+        lo += 1
+    while hi > lo and text[hi - 1].isspace():
+        hi -= 1
+    return lo, hi
+
+
+def _skip_to_value(text: str, z: int, hi: int) -> int:
+    # skip the delimiter run after a key
+    while z < hi and not text[z].isalnum():
+        z += 1
+    return z
+
+
+class KeySegmenter:
+    """
+    Two-level KEYS / INLINE_KEYS segmentation in one automaton pass.
+
+    Gives what the parsers' old `*_parser_v2(*_parser_v1(narr))` gave
+    (kept in benchmarks/bench_segmenter.py): top-level keys cut the
+    narrative into value spans, inline keys are then matched inside each
+    value span as if it were the whole text. Both key lists share one
+    automaton, inline hits are assigned to their enclosing span by
+    offset, and only the final values are sliced.
+
+    The key parsers (ach / wire / swift / all) take theirs from
+    KeyRegistry.segmenter(): KEYS + INLINE_KEYS of the current registry
+    version, compiled once per version.
+    """
+
+    def __init__(self, keys, inline_keys, allowed):
+        self.top = len(keys)
+        self.matcher = KeyMatcher(list(keys) + list(inline_keys), allowed)
+
+    def segment(self, text: str):
+        """
+        Returns (fields, inline): fields is [(key, start, end)] in text
+        order, the first one being ("Meta", ...) for the text before the
+        first key, with value spans stripped; inline holds the inline
+        key occurrences (start, key id), by start.
+        """
+        top, inline = [], []
+        for i, p in self.matcher.occurrences(text):
+            (top if p < self.top else inline).append((i, p))
+        inline.sort()
+
+        marks = self.matcher.select(text, top, 0, len(text))
+        starts = list(marks) + [len(text)]
+
+        fields = [("Meta", *_strip(text, 0, starts[0]))]
+        for n, start in enumerate(starts[:-1]):
+            raw_k = marks[start]
+            z = _skip_to_value(text, start + len(raw_k), len(text))
+            fields.append((raw_k, *_strip(text, z, max(z, starts[n + 1]))))
+
+        return fields, inline
+
+    def split(self, text: str, lo: int, hi: int, inline, inline_name=None):
+        """
+        The old split_inline_keys(text[lo:hi]) over a stripped value span.
+        """
+        k0 = bisect_left(inline, (lo, -1))
+        k1 = bisect_left(inline, (hi, -1), k0)
+        marks = self.matcher.select(text, inline[k0:k1], lo, hi)
+
+        if not marks:
+            return text[lo:hi]
+
+        starts = list(marks) + [hi]
+        out = {"value": text[slice(*_strip(text, lo, starts[0]))]}
+
+        for n, start in enumerate(starts[:-1]):
+            raw_k = marks[start]
+            k = inline_name(raw_k) if inline_name else raw_k
+            z = _skip_to_value(text, start + len(raw_k), hi)
+            out[k] = text[slice(*_strip(text, z, max(z, starts[n + 1])))]
+
+        return out
+
+    def _inline_hits(self, text: str, inline, spans) -> tuple:
+        # inline occurrences that are standalone inside some value span,
+        # the only ones split() can ever accept
+        spans = sorted(spans)
+        los = [lo for lo, _ in spans]
+        allowed = self.matcher.allowed
+        keys = self.matcher.keys
+
+        hits = []
+        for i, p in inline:
+            k = bisect_right(los, i) - 1
+            if k < 0:
+                continue
+            lo, hi = spans[k]
+            end = i + len(keys[p])
+            if end > hi:
+                continue
+            if (i == lo or text[i - 1] in allowed) and (end == hi or text[end] in allowed):
+                hits.append((i, p))
+        return tuple(hits)
+
+    def parse(
+        self,
+        text: str,
+        key_name=None,
+        inline_name=None,
+        keep_whole=None,
+        lazy: bool = False,
+        compact: bool = False
+    ):
+        """
+        {key: value | {"value": ..., inline key: ...}} for `text`.
+
+        key_name / inline_name map raw keys to output keys, keep_whole(key)
+        leaves that key's value unsplit. lazy=True returns a ParseResult
+        instead, values are only built when read. compact=True returns
+        Records instead of dicts, at every level.
+        """
+        if lazy and compact:
+            raise ValueError("lazy and compact are exclusive")
+
+        fields, inline = self.segment(text)
+
+        # later duplicates overwrite earlier ones, like the v1 dict
+        spans = {}
+        for n, (raw_k, lo, hi) in enumerate(fields):
+            k = key_name(raw_k) if key_name and n else raw_k
+            spans[k] = (lo, hi)
+
+        if lazy:
+            return ParseResult(
+                self,
+                text,
+                tuple(spans),
+                array("I", [b for span in spans.values() for b in span]),
+                self._inline_hits(text, inline, spans.values()),
+                inline_name,
+                keep_whole
+            )
+
+        out = {}
+        for k, (lo, hi) in spans.items():
+            if keep_whole and keep_whole(k):
+                out[k] = text[lo:hi]
+            else:
+                out[k] = self.split(text, lo, hi, inline, inline_name)
+
+        if compact:
+            return Record.from_dict(out)
+        return out
+
+
+class ParseResult(Mapping):
+    """
+    Lazy parser output: the narrative once, the keys (fields), a flat
+    array of their (start, end) value bounds and the inline key hits.
+
+    Reads like the dict the parser returns (same keys, same order, same
+    values), but a value is only sliced / inline-split when it is read
+    and nothing is kept. to_dict() gives the plain dict.
+    """
+
+    __slots__ = (
+        "segmenter", "text", "fields", "bounds", "inline",
+        "inline_name", "keep_whole",
+    )
+
+    def __init__(
+        self,
+        segmenter,
+        text,
+        fields,
+        bounds,
+        inline=(),
+        inline_name=None,
+        keep_whole=None
+    ):
+        self.segmenter = segmenter
+        self.text = text
+        self.fields = fields
+        self.bounds = bounds
+        self.inline = inline
+        self.inline_name = inline_name
+        self.keep_whole = keep_whole
+
+    def span(self, key):
+        """
+        (start, end) of the value of `key` in the narrative.
+        """
+        try:
+            n = 2 * self.fields.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        return self.bounds[n], self.bounds[n + 1]
+
+    def __getitem__(self, key):
+        lo, hi = self.span(key)
+        if self.keep_whole and self.keep_whole(key):
+            return self.text[lo:hi]
+        return self.segmenter.split(self.text, lo, hi, self.inline, self.inline_name)
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __contains__(self, key):
+        return key in self.fields
+
+    def to_dict(self) -> dict:
+        return {k: self[k] for k in self.fields}
+
+    def __repr__(self):
+        return f"ParseResult({self.to_dict()!r})"
+
+
+# field names tuple -> the shared, interned copy (see Record)
+_LAYOUTS = {}
+
+
+def _layout(fields: tuple) -> tuple:
+    layout = _LAYOUTS.get(fields)
+    if layout is None:
+        layout = tuple(sys.intern(f) for f in fields)
+        _LAYOUTS[layout] = layout
+    return layout
+
+
+class Record(Mapping):
+    """
+    Compact parser output: a tuple of field names and a tuple of values
+    (str, or a nested Record for inline-split values).
+
+    Field name tuples are interned per key layout, so the rows of a
+    batch share one tuple per layout instead of each holding a dict.
+    Reads like the parser dict; to_dict() gives it back, for JSON / API
+    boundaries.
+    """
+
+    __slots__ = ("fields", "values")
+
+    def __init__(self, fields, values):
+        self.fields = fields
+        self.values = values
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Record":
+        return cls(
+            _layout(tuple(d)),
+            tuple(cls.from_dict(v) if isinstance(v, dict) else v for v in d.values())
+        )
+
+    def __getitem__(self, key):
+        try:
+            return self.values[self.fields.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def __contains__(self, key):
+        return key in self.fields
+
+    def to_dict(self) -> dict:
+        return {
+            k: v.to_dict() if isinstance(v, Record) else v
+            for k, v in zip(self.fields, self.values)
+        }
+
+    def __repr__(self):
+        return f"Record({self.to_dict()!r})"
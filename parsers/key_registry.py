@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ModuleNotFoundError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+from key_engine.store_file import file_changed, read_stamped, write_json_atomic
+from parsers.key_matcher import KeySegmenter
+
+
+PARSERS_DIR = Path(__file__).parent
+
+# keys as the parsers use them: KEYS deduplicated, both lists longest first
+KeySet = namedtuple("KeySet", "version keys inline_keys")
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exclusive lock across processes on `path` (created if missing).
+    """
+    with open(path, "a+b") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class KeyRegistry:
+    """
+    Key lists of one parser format, stored in parsers/<fmt>/keys.json:
+
+        {"version": 3, "KEYS": [...], "INLINE_KEYS": [...]}
+
+    - current() re-reads the file when it changed on disk (checked at
+      most every `check_interval` seconds), so running parsers pick up
+      approved keys without a restart
+    - segmenter(allowed) is compiled once per loaded version
+    - add() is the only writer: file lock, read, merge, version + 1,
+      temp file + rename
+    """
+
+    def __init__(self, fmt: str, check_interval: float = 1.0):
+        self.fmt = fmt
+        self.path = PARSERS_DIR / fmt / "keys.json"
+        self.lock_path = PARSERS_DIR / fmt / "keys.json.lock"
+        self.check_interval = check_interval
+
+        self._keys = None
+        self._stamp = None
+        self._last_check = 0.0
+
+        # frozenset(allowed) -> (KeySet, KeySegmenter)
+        self._segmenters = {}
+
+    def _read(self) -> KeySet:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        return KeySet(
+            data["version"],
+            sorted(dict.fromkeys(data["KEYS"]), key=len, reverse=True),
+            sorted(data["INLINE_KEYS"], key=len, reverse=True)
+        )
+
+    def current(self) -> KeySet:
+        now = time.monotonic()
+        if self._keys is not None and now - self._last_check < self.check_interval:
+            return self._keys
+        self._last_check = now
+
+        if self._keys is None or file_changed(self.path, self._stamp):
+            try:
+                stamp, keys = read_stamped(self.path, self._read)
+            except (OSError, ValueError, KeyError):
+                # unreadable: keep the loaded keys, retry on the next check
+                if self._keys is None:
+                    raise
+                return self._keys
+            self._stamp = stamp
+            self._keys = keys
+
+        return self._keys
+
+    def refresh(self) -> KeySet:
+        """
+        current() without waiting for the check interval.
+        """
+        self._last_check = float("-inf")
+        return self.current()
+
+    @property
+    def version(self) -> int:
+        return self.current().version
+
+    def segmenter(self, allowed) -> KeySegmenter:
+        keys = self.current()
+        sig = frozenset(allowed)
+
+        hit = self._segmenters.get(sig)
+        if hit is None or hit[0] is not keys:
+            # recompile just this format's automaton
+            hit = (keys, KeySegmenter(keys.keys, keys.inline_keys, allowed))
+            self._segmenters[sig] = hit
+        return hit[1]
+
+    def add(self, keys=(), inline_keys=()) -> int:
+        """
+        Adds missing keys in one locked, atomic write.
+        Returns the store version (unchanged if nothing was missing).
+        """
+        with file_lock(self.lock_path):
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+
+            changed = False
+            for target, new in (("KEYS", keys), ("INLINE_KEYS", inline_keys)):
+                missing = [k for k in dict.fromkeys(new) if k not in data[target]]
+                if missing:
+                    # dedupe + sort DESC by length, like the old keys.py lists
+                    data[target] = sorted(
+                        set(data[target]) | set(missing),
+                        key=lambda x: (-len(x), x)
+                    )
+                    changed = True
+
+            if changed:
+                data["version"] += 1
+                write_json_atomic(self.path, data)
+
+        self.refresh()
+        return data["version"]
+
+
+# fmt -> KeyRegistry, one per process
+_REGISTRIES = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def registry(fmt: str) -> KeyRegistry:
+    with _REGISTRIES_LOCK:
+        reg = _REGISTRIES.get(fmt)
+        if reg is None:
+            reg = KeyRegistry(fmt)
+            _REGISTRIES[fmt] = reg
+        return reg
@@ -0,0 +1,83 @@
+import string
+
+# ASCII punctuation -> " ": what is left of it in the "detect" form
+# (brackets, quotes, "*", "&", ...) separates words too
+_WORD_SEP = "".join(c for c in string.punctuation if c != "_").encode()
+_WORDS = bytes.maketrans(_WORD_SEP, b" " * len(_WORD_SEP))
+
+
+def _separated(text: str) -> bytes:
+    # utf-8 keeps non-ASCII letters inside their word
+    return text.encode("utf-8", "surrogatepass").translate(_WORDS)
+
+
+class KeywordScorer:
+    """
+    Weighted keyword scores of a narrative, every format in one pass.
+
+    keywords: {format: [(keyword, weight), ...]} (util.KEYWORDS).
+    score() takes the "detect" form of the narrative (lower, collapsed,
+    see parsers/narrative.py) and returns ({format: score}, matched
+    keywords); every keyword scores once, however often it occurs.
+
+    strict (default): keywords match whole words, phrases whole word
+    sequences, so "tel" does not score in "hotel" nor "fed" in "fedex".
+    Words are separated by spaces and ASCII punctuation other than "_".
+    Candidates come from one set intersection of the narrative's words
+    with the keywords' first words; only phrases are then checked in
+    full.
+
+    strict=False: the plain substring test (`keyword in text`), as
+    detect_format scored before.
+    """
+
+    def __init__(self, keywords: dict, strict: bool = True):
+        self.formats = tuple(keywords)
+        self.strict = strict
+
+        # (keyword, format, weight), keyword table order
+        self.table = tuple(
+            (kw, fmt, weight)
+            for fmt, items in keywords.items()
+            for kw, weight in items
+        )
+
+        # first word -> ((keyword, " phrase " or None, format, weight), ...)
+        by_first = {}
+        for kw, fmt, weight in self.table:
+            words = _separated(kw).split()
+            if not words:
+                continue
+            phrase = b" " + b" ".join(words) + b" " if len(words) > 1 else None
+            by_first.setdefault(words[0], []).append((kw, phrase, fmt, weight))
+
+        self.by_first = {w: tuple(entries) for w, entries in by_first.items()}
+        self.first_words = frozenset(self.by_first)
+
+    def score(self, text: str) -> tuple:
+        scores = dict.fromkeys(self.formats, 0)
+        matched = set()
+
+        if not self.strict:
+            for kw, fmt, weight in self.table:
+                if kw in text:
+                    scores[fmt] += weight
+                    matched.add(kw)
+            return scores, matched
+
+        sep = _separated(text)
+        hits = self.first_words.intersection(sep.split())
+        if not hits:
+            return scores, matched
+
+        # text is collapsed: a phrase's words are one space or one
+        # punctuation mark apart, both are spaces in `sep`
+        padded = b" " + sep + b" "
+        by_first = self.by_first
+        for first in hits:
+            for kw, phrase, fmt, weight in by_first[first]:
+                if phrase is None or phrase in padded:
+                    scores[fmt] += weight
+                    matched.add(kw)
+
+        return scores, matched
@@ -1,12 +1,8 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"[,\s]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma_tail")
 
 MERCHANT_REF_SIMPLE_RE = re.compile(
     r"^[A-Z0-9 .&'-]+?\s+[A-Z0-9-]{2,}\s+\d{6,}\s+\d{6,}$"
@@ -24,7 +20,7 @@ MERCHANT_REF_CONTEXT_RE = re.compile(
     re.VERBOSE
 )
 
-def is_merchant_reference(line: str) -> bool:
+def is_merchant_reference(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     return bool(
         MERCHANT_REF_SIMPLE_RE.match(norm)
@@ -33,7 +29,7 @@ def is_merchant_reference(line: str) -> bool:
 
 
 
-def parse_merchant_reference(line: str) -> dict:
+def parse_merchant_reference(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
     parts = norm.split()
 
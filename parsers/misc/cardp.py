@@ -1,12 +1,8 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"[,\s]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma_tail")
 
 CARD_PAYMENT_RECOGNISE_RE = re.compile(
     r"""
@@ -19,7 +15,7 @@ CARD_PAYMENT_RECOGNISE_RE = re.compile(
     re.VERBOSE
 )
 
-def is_card_payment(line: str) -> bool:
+def is_card_payment(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -44,7 +40,7 @@ CARD_PAYMENT_PARSE_RE = re.compile(
     re.VERBOSE
 )
 
-def parse_card_payment(line: str) -> dict:
+def parse_card_payment(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     m = CARD_PAYMENT_PARSE_RE.search(norm)
@@ -1,12 +1,8 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"[,\s]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma_tail")
 
 INVOICE_REFERENCE_RECOGNISE_RE = re.compile(
     r".+\/INVOICE\s+\w+\s+.+"
@@ -17,7 +13,7 @@ INVOICE_ALT_RECOGNISE_RE = re.compile(
     re.IGNORECASE
 )
 
-def is_invoice_reference(line: str) -> bool:
+def is_invoice_reference(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -41,7 +37,7 @@ INVOICE_ALT_PARSE_RE = re.compile(
     re.IGNORECASE
 )
 
-def parse_invoice_reference(line: str) -> dict:
+def parse_invoice_reference(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     # first try slash /INVOICE format
@@ -1,18 +1,14 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"[,\s]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma_tail")
 
 WEB_TRANSFER_RECOGNISE_RE = re.compile(
     r"\bWEB\s+TFR\s+FR\s+\d+"
 )
 
-def is_web_transfer(line: str) -> bool:
+def is_web_transfer(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -32,7 +28,7 @@ WEB_TRANSFER_PARSE_RE = re.compile(
     re.VERBOSE
 )
 
-def parse_web_transfer(line: str) -> dict:
+def parse_web_transfer(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     m = WEB_TRANSFER_PARSE_RE.search(norm)
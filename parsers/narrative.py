@@ -0,0 +1,139 @@
+def _collapse(s: str) -> str:
+    # re.sub(r"\s+", " ", s).strip(), without the regex
+    return " ".join(s.split())
+
+
+def _rstrip_eol(s: str, chars: str) -> str:
+    # re.sub(f"[{chars}]+$", "", s): `$` also matches before a final "\n"
+    if s.endswith("\n"):
+        return s[:-1].rstrip(chars) + "\n"
+    return s.rstrip(chars)
+
+
+_PIPES = str.maketrans({",": " ", "|": " ", "\\": " "})
+
+# normalize_spaces(): drop ".", "," -> " ", delimiters become own tokens
+_SPACED = str.maketrans({
+    ".": None, ",": " ",
+    ":": " : ", "=": " = ", ";": " ; ", "#": " # ",
+})
+
+# normalize_for_detect(): lowered, then [.,:/-] -> " " and normalize_spaces()
+_DETECT = str.maketrans({
+    ".": " ", ",": " ", ":": " ", "/": " ", "-": " ",
+    "=": " = ", ";": " ; ", "#": " # ",
+})
+
+
+# NORMALIZATION RULES
+# rule -> kernel, one per normalize_narrative flavour found in the tree.
+# Each gives byte for byte what its regex version gives.
+RULES = {
+    # ^[,|]+ and [\\|,]+$ off, collapse, upper
+    # util, paypal, directdebit, avidpay check
+    "edges": lambda s: _collapse(_rstrip_eol(s.lstrip(",|"), "\\|,")).upper(),
+
+    # leading commas off, collapse, upper
+    # fundsTransfer, processor_eft, disbursement
+    "lead_comma": lambda s: _collapse(s.lstrip(",")).upper(),
+
+    # leading commas and [,\s]+$ off, collapse, upper
+    # avidpay generic, misc, merchref, remittance, vendorpymt
+    "lead_comma_tail": lambda s: _collapse(s.lstrip(",")).rstrip(", ").upper(),
+
+    # commas off both edges, collapse, upper
+    # vendorpay
+    "commas": lambda s: _collapse(s.strip(",")).upper(),
+
+    # upper, [\\|,]+ -> " ", collapse
+    # spanish patterns 7, 8, 9, 10, 12
+    "no_pipes": lambda s: _collapse(s.upper().translate(_PIPES)),
+
+    # upper, ^[,|\\]+ and [\\|,]+$ off, collapse
+    # spanish patterns 1 - 6, 11
+    "edges_upper": lambda s: _collapse(_rstrip_eol(s.upper().lstrip(",|\\"), "\\|,")),
+
+    # util.normalize_spaces
+    "spaced": lambda s: _collapse(s.translate(_SPACED)),
+
+    # util.normalize_for_detect
+    "detect": lambda s: _collapse(s.lower().translate(_DETECT)),
+}
+
+
+class NormalizedNarrative:
+    """
+    One narrative, normalized once per rule.
+
+    Recognizers and parsers take it wherever they take the narrative
+    string: their normalize_narrative() returns the cached form of their
+    rule instead of running its regexes again. strip() and truth testing
+    behave like the string's.
+    """
+
+    __slots__ = ("raw", "_forms", "_stripped")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self._forms = {}
+        self._stripped = None
+
+    def form(self, rule: str) -> str:
+        out = self._forms.get(rule)
+        if out is None:
+            out = RULES[rule](self.raw) if self.raw else ""
+            self._forms[rule] = out
+        return out
+
+    @property
+    def upper(self) -> str:
+        # upper-cased, collapsed, edge delimiters off
+        return self.form("edges")
+
+    @property
+    def spaced(self) -> str:
+        return self.form("spaced")
+
+    @property
+    def detect(self) -> str:
+        return self.form("detect")
+
+    def strip(self) -> "NormalizedNarrative":
+        if self._stripped is None:
+            raw = self.raw.strip()
+            self._stripped = self if raw == self.raw else NormalizedNarrative(raw)
+        return self._stripped
+
+    def __bool__(self):
+        return bool(self.raw)
+
+    def __str__(self):
+        return self.raw
+
+    def __repr__(self):
+        return f"NormalizedNarrative({self.raw!r})"
+
+
+def narrative(text) -> NormalizedNarrative:
+    """
+    `text` as a NormalizedNarrative, as is when it already is one.
+    """
+    if isinstance(text, NormalizedNarrative):
+        return text
+    return NormalizedNarrative(text)
+
+
+def normalized(line, rule: str) -> str:
+    """
+    `line` (str or NormalizedNarrative) normalized with `rule`.
+
+    Every normalize_narrative() in the parsers is this call with the
+    parser's rule, so a NormalizedNarrative runs each rule at most once.
+    Parsers that also take `recognized=True` skip their own is_*() check:
+    the recognizer already matched the same normalized text.
+    """
+    if isinstance(line, NormalizedNarrative):
+        return line.form(rule)
+    if not line:
+        return ""
+    return RULES[rule](line)
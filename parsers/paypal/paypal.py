@@ -1,16 +1,13 @@
 import re
 import json
+from parsers.detection import Detection
+from parsers.narrative import NormalizedNarrative, normalized
 
 # ---------------------------------------------------------
 # NORMALIZATION
 # ---------------------------------------------------------
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = re.sub(r"^[,|]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges")
 
 
 # ---------------------------------------------------------
@@ -39,26 +36,34 @@ PAYPAL_ACH_RETURN_PARSE_RE = re.compile(
 # ---------------------------------------------------------
 # CLASSIFIER
 # ---------------------------------------------------------
-def classify_paypal(line: str) -> str | None:
+def detect_paypal(line: str | NormalizedNarrative) -> Detection | None:
+    # PayPal class as format and pattern, plus the match that decided it
     norm = normalize_narrative(line)
 
     if "PAYPAL" not in norm:
         return None
 
-    if PAYPAL_ACH_RETURN_PARSE_RE.search(norm):
-        return "PAYPAL_ACH_RETURN"
+    m = PAYPAL_ACH_RETURN_PARSE_RE.search(norm)
+    if m:
+        return Detection("PAYPAL_ACH_RETURN", "PAYPAL_ACH_RETURN", m)
+
+    m = PAYPAL_RDC_RE.search(norm)
+    if m:
+        return Detection("PAYPAL_RDC_DEPOSIT", "PAYPAL_RDC_DEPOSIT", m)
+
+    return Detection("PAYPAL_OTHER", "PAYPAL_OTHER")
 
-    if PAYPAL_RDC_RE.search(norm):
-        return "PAYPAL_RDC_DEPOSIT"
 
-    return "PAYPAL_OTHER"
+def classify_paypal(line: str | NormalizedNarrative) -> str | None:
+    d = detect_paypal(line)
+    return d.format if d else None
 
 
 # ---------------------------------------------------------
 # PARSERS
 # ---------------------------------------------------------
 
-def parse_paypal_rdc(line: str) -> dict:
+def parse_paypal_rdc(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     # find 6-digit token for deposit code
@@ -77,10 +82,11 @@ def parse_paypal_rdc(line: str) -> dict:
     }
 
 
-def parse_paypal_ach_return(line: str) -> dict:
+def parse_paypal_ach_return(line: str | NormalizedNarrative, match=None) -> dict:
     norm = normalize_narrative(line)
 
-    m = PAYPAL_ACH_RETURN_PARSE_RE.search(norm)
+    # match: from detect_paypal, same pattern on the same text
+    m = match or PAYPAL_ACH_RETURN_PARSE_RE.search(norm)
     if not m:
         return {
             "META": norm,
@@ -97,14 +103,17 @@ def parse_paypal_ach_return(line: str) -> dict:
     }
 
 
-def parse_paypal(line: str) -> dict | None:
-    cls = classify_paypal(line)
+def parse_paypal(line: str | NormalizedNarrative, detection=None) -> dict | None:
+    # detection: detect_paypal(line), when the caller already has it
+    if detection is None:
+        detection = detect_paypal(line)
+    cls = detection.pattern if detection else None
 
     if cls == "PAYPAL_RDC_DEPOSIT":
         return parse_paypal_rdc(line)
 
     if cls == "PAYPAL_ACH_RETURN":
-        return parse_paypal_ach_return(line)
+        return parse_paypal_ach_return(line, detection.match)
 
     if cls == "PAYPAL_OTHER":
         return {
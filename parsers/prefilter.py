@@ -0,0 +1,53 @@
+class TriggerFilter:
+    """
+    Which recognizers can possibly fire on a narrative, from their
+    required literal triggers, as a bitmask.
+
+    spec: {name: triggers} in recognizer order. A recognizer can only
+    fire when one of its triggers is in the narrative; "^TRIGGER" must
+    be at the start. Recognizers without triggers always pass.
+
+    mask() takes the "no_pipes" form of the narrative (upper, collapsed,
+    [,|\\] -> " ", see parsers/narrative.py): every other normalization
+    rule keeps a trigger only if that form has it too. Non-ASCII text
+    passes everything, IGNORECASE patterns fold some of it into ASCII.
+    """
+
+    def __init__(self, spec: dict):
+        self.names = list(spec)
+        self.bits = {name: 1 << i for i, name in enumerate(self.names)}
+        self.all = (1 << len(self.names)) - 1
+
+        self.always = 0
+        literals = {}
+        prefixes = {}
+        for name, triggers in spec.items():
+            bit = self.bits[name]
+            if not triggers:
+                self.always |= bit
+            for t in triggers:
+                if t.startswith("^"):
+                    prefixes[t[1:]] = prefixes.get(t[1:], 0) | bit
+                else:
+                    literals[t] = literals.get(t, 0) | bit
+
+        # one pass over the trigger table, C substring search per literal:
+        # measured faster than a combined (?=(a|b|...)) regex scan
+        self.literals = tuple(literals.items())
+        self.prefixes = tuple(prefixes.items())
+
+    def mask(self, text: str) -> int:
+        if not text.isascii():
+            return self.all
+
+        m = self.always
+        for lit, bits in self.literals:
+            if lit in text:
+                m |= bits
+        for prefix, bits in self.prefixes:
+            if text.startswith(prefix):
+                m |= bits
+        return m
+
+    def bit(self, name: str) -> int:
+        return self.bits[name]
@@ -1,14 +1,11 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
 # ---------------------------------------------------------
 # 1. Normalization (run ONCE before any recognition/parsing)
 # ---------------------------------------------------------
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma")
 
 PROCESSOR_EFT_RECOGNISE_RE = re.compile(
     r"""
@@ -28,10 +25,11 @@ PROCESSOR_EFT_RECOGNISE_RE = re.compile(
 
 
 
-def is_processor_eft(line: str) -> bool:
+def match_processor_eft(line: str | NormalizedNarrative):
+    # the recognizing match, reused by parse_processor_eft
     norm = normalize_narrative(line)
     if not norm:
-        return False
+        return None
 
     # hard guards — do NOT collide with rails
     if (
@@ -39,15 +37,21 @@ def is_processor_eft(line: str) -> bool:
     or "WIRE" in norm
     or "FED" in norm
     or "RDC" in norm
-    or re.search(r"\bCARD\b", norm)): return False
+    or re.search(r"\bCARD\b", norm)): return None
 
 
-    return bool(PROCESSOR_EFT_RECOGNISE_RE.search(norm))
+    return PROCESSOR_EFT_RECOGNISE_RE.search(norm)
 
-def parse_processor_eft(line: str) -> dict:
+def is_processor_eft(line: str | NormalizedNarrative) -> bool:
+    return bool(match_processor_eft(line))
+
+def parse_processor_eft(line: str | NormalizedNarrative, detection=None) -> dict:
     norm = normalize_narrative(line)
 
-    m = PROCESSOR_EFT_RECOGNISE_RE.search(norm)
+    # detection.match: match_processor_eft(line), same pattern and text
+    m = detection.match if detection is not None else None
+    if m is None:
+        m = PROCESSOR_EFT_RECOGNISE_RE.search(norm)
     if not m:
         return {
             "META": norm,
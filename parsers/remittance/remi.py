@@ -1,17 +1,13 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"[,\s]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma_tail")
 
 REMITTANCE_RECOGNISE_RE = re.compile(r"^(?!.*\bACH\b)(?!.*\bWIRE\b)(?!.*\bFED\b)(?!.*\bCARD\b)(?!.*\bRDC\b).*?\bTRN\*\d+\*[^\\]+\s*\\\s*RMR\*")
 
 
-def is_remittance_advice(line: str) -> bool:
+def is_remittance_advice(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -32,7 +28,7 @@ REMITTANCE_PARSE_RE = re.compile(
 RMR_REF_RE = re.compile(r"RMR\*[^*]*\*([^\\]+)")
 ID_TOKEN_RE = re.compile(r"\b[A-Z0-9]{8,}\b")
 
-def parse_remittance_advice(line: str) -> dict:
+def parse_remittance_advice(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     m = REMITTANCE_PARSE_RE.search(norm)
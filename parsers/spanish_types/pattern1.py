@@ -1,15 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"^[,|\\]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges_upper")
 
 
 # ==========================
@@ -24,7 +19,7 @@ pattern1 = re.compile(
 )
 
 
-def is_pattern1(line: str) -> bool:
+def is_pattern1(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     line_n = normalize_narrative(line)
@@ -63,7 +58,7 @@ pattern1_short = re.compile(
 )
 
 
-def parse_pattern1(line: str) -> dict | None:
+def parse_pattern1(line: str | NormalizedNarrative) -> dict | None:
     if not line:
         return None
 
@@ -1,14 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"[\\|,]+", " ", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "no_pipes")
 
 
 pattern10 = re.compile(
@@ -17,7 +13,7 @@ pattern10 = re.compile(
 )
 
 
-def is_pattern10(line: str) -> bool:
+def is_pattern10(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     txt = normalize_narrative(line)
@@ -48,13 +44,13 @@ def extract_info(txt: str) -> str | None:
     return None
 
 
-def parse_pattern10(line: str) -> dict | None:
+def parse_pattern10(line: str | NormalizedNarrative, recognized: bool = False) -> dict | None:
     if not line:
         return None
 
     txt = normalize_narrative(line)
 
-    if not is_pattern10(txt):
+    if not recognized and not is_pattern10(txt):
         return None
 
     payer_id = extract_payer_id(txt)
@@ -1,15 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"^[,|\\]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges_upper")
 
 
 card_keywords = [
@@ -32,7 +27,7 @@ pattern11 = re.compile(
 )
 
 
-def is_pattern11(line: str) -> bool:
+def is_pattern11(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     txt = normalize_narrative(line)
@@ -52,7 +47,7 @@ def extract_network(txt: str) -> str | None:
     return None
 
 
-def parse_pattern11(line: str) -> dict | None:
+def parse_pattern11(line: str | NormalizedNarrative) -> dict | None:
     if not line:
         return None
 
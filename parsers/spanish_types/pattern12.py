@@ -1,20 +1,16 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"[\\|,]+", " ", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "no_pipes")
 
 
 pattern12 = re.compile(r"\bSPEI\b", re.IGNORECASE)
 
 
-def is_pattern12(line: str) -> bool:
+def is_pattern12(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     txt = normalize_narrative(line)
@@ -72,13 +68,13 @@ def extract_counterparty(txt: str, reference: str | None) -> str | None:
     return " ".join(ctpty) if ctpty else None
 
 
-def parse_pattern12(line: str) -> dict | None:
+def parse_pattern12(line: str | NormalizedNarrative, recognized: bool = False) -> dict | None:
     if not line:
         return None
 
     txt = normalize_narrative(line)
 
-    if not is_pattern12(txt):
+    if not recognized and not is_pattern12(txt):
         return None
 
     direction = infer_direction(txt)
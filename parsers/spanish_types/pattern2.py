@@ -1,21 +1,16 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"^[,|\\]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges_upper")
 
 pattern2 = re.compile(
     r"^/[A-Z]{3}/\d{4}-PAGO TRANSFERENCIA",
     re.IGNORECASE
 )
 
-def is_pattern2(line: str) -> bool:
+def is_pattern2(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     line_n = normalize_narrative(line)
@@ -56,7 +51,7 @@ def extract_iva(raw: str) -> str | None:
     match = re.search(r"IVA\s+([0-9]+)", raw)
     return match.group(1) if match else None
 
-def parse_pattern2(line: str) -> dict | None:
+def parse_pattern2(line: str | NormalizedNarrative) -> dict | None:
     if not line:
         return None
 
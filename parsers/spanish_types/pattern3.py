@@ -1,15 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"^[,|\\]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges_upper")
 
 
 pattern3 = re.compile(
@@ -18,7 +13,7 @@ pattern3 = re.compile(
 )
 
 
-def is_pattern3(line: str) -> bool:
+def is_pattern3(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     return bool(pattern3.search(normalize_narrative(line)))
@@ -37,7 +32,7 @@ pattern3_parse = re.compile(
 )
 
 
-def parse_pattern3(line: str) -> dict | None:
+def parse_pattern3(line: str | NormalizedNarrative) -> dict | None:
     if not line:
         return None
 
@@ -1,15 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"^[,|\\]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges_upper")
 
 
 # ========================
@@ -26,7 +21,7 @@ pattern4_qrcode = re.compile(
 )
 
 
-def is_pattern4(line: str) -> bool:
+def is_pattern4(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     txt = normalize_narrative(line)
@@ -72,7 +67,7 @@ def parse_qrs_payload(txt: str):
 # ========================
 # MAIN PARSER
 # ========================
-def parse_pattern4(line: str) -> dict | None:
+def parse_pattern4(line: str | NormalizedNarrative) -> dict | None:
     if not line:
         return None
 
@@ -1,15 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"^[,|\\]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges_upper")
 
 
 pattern5 = re.compile(
@@ -18,13 +13,13 @@ pattern5 = re.compile(
 )
 
 
-def is_pattern5(line: str) -> bool:
+def is_pattern5(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     return bool(pattern5.search(normalize_narrative(line)))
 
 
-def parse_pattern5(line: str) -> dict | None:
+def parse_pattern5(line: str | NormalizedNarrative) -> dict | None:
     if not line:
         return None
     
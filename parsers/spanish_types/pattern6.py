@@ -1,15 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"^[,|\\]+", "", line)
-    line = re.sub(r"[\\|,]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges_upper")
 
 
 pattern6 = re.compile(
@@ -18,7 +13,7 @@ pattern6 = re.compile(
 )
 
 
-def is_pattern6(line: str) -> bool:
+def is_pattern6(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     return bool(pattern6.search(normalize_narrative(line)))
@@ -65,7 +60,7 @@ def parse_mov_pos(txt: str) -> dict | None:
     }
 
 
-def parse_pattern6(line: str) -> dict | None:
+def parse_pattern6(line: str | NormalizedNarrative) -> dict | None:
     if not line:
         return None
 
@@ -1,14 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"[\\|,]+", " ", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "no_pipes")
 
 
 pattern7 = re.compile(
@@ -17,7 +13,7 @@ pattern7 = re.compile(
 )
 
 
-def is_pattern7(line: str) -> bool:
+def is_pattern7(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     txt = normalize_narrative(line)
@@ -85,13 +81,13 @@ def infer_direction(txt: str) -> str:
     return "OUTGOING"
 
 
-def parse_pattern7(line: str) -> dict | None:
+def parse_pattern7(line: str | NormalizedNarrative, recognized: bool = False) -> dict | None:
     if not line:
         return None
 
     txt = normalize_narrative(line)
 
-    if not is_pattern7(txt):
+    if not recognized and not is_pattern7(txt):
         return None
 
     direction = infer_direction(txt)
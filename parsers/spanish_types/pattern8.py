@@ -1,14 +1,10 @@
 import re
 import json
+from parsers.narrative import NormalizedNarrative, normalized
 
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.upper()
-    line = re.sub(r"[\\|,]+", " ", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "no_pipes")
 
 
 pattern8 = re.compile(
@@ -17,7 +13,7 @@ pattern8 = re.compile(
 )
 
 
-def is_pattern8(line: str) -> bool:
+def is_pattern8(line: str | NormalizedNarrative) -> bool:
     if not line:
         return False
     txt = normalize_narrative(line)
@@ -100,13 +96,13 @@ def extract_reference(txt: str) -> str | None:
     return m.group(1) if m else None
 
 
-def parse_pattern8(line: str) -> dict | None:
+def parse_pattern8(line: str | NormalizedNarrative, recognized: bool = False) -> dict | None:
     if not line:
         return None
 
     txt = normalize_narrative(line)
 
-    if not is_pattern8(txt):
+    if not recognized and not is_pattern8(txt):
         return None
 
     merchant = extract_merchant(txt)
@@ -11,70 +11,70 @@ from parsers.spanish_types.pattern10 import is_pattern10, parse_pattern10
 from parsers.spanish_types.pattern11 import is_pattern11, parse_pattern11
 from parsers.spanish_types.pattern12 import is_pattern12, parse_pattern12
 
+from parsers.detection import Detection
+from parsers.narrative import NormalizedNarrative, narrative
+from parsers.prefilter import TriggerFilter
 
-def is_spanish(line: str) -> int | None:
+
+# pattern -> (recognizer, parser, literals it cannot match without)
+PATTERNS = {
+    1: (is_pattern1, parse_pattern1, ("PT/DE/EI/",)),
+    2: (is_pattern2, parse_pattern2, ("-PAGO TRANSFERENCIA",)),
+    3: (is_pattern3, parse_pattern3, ("RRN",)),
+    4: (is_pattern4, parse_pattern4, ("PIX",)),
+    5: (is_pattern5, parse_pattern5, ("^DB",)),
+    6: (is_pattern6, parse_pattern6, ("^066", "^MOV POS")),
+    7: (is_pattern7, parse_pattern7, ("TRASPASO",)),
+    8: (is_pattern8, parse_pattern8, ("CONTRACARGO", "CHARGEBACK")),
+    9: (is_pattern9, parse_pattern9, ("CITIDIRECT",)),
+    10: (is_pattern10, parse_pattern10, ("/IDCODE/",)),
+    11: (is_pattern11, parse_pattern11, ("DINERS", "VISA", "MASTERCARD", "AMEX", "AMERICAN EXPRESS",
+                                         "DISCOVER", "REDCARD", "PROSA")),
+    12: (is_pattern12, parse_pattern12, ("SPEI",)),
+}
+
+# parsers that skip their own is_pattern check once detection matched:
+# their rule ("no_pipes") normalizes the stripped narrative detection saw
+# and the raw one they get to the same text
+RECOGNIZED_OK = {7, 8, 9, 10, 12}
+
+PATTERN_FILTER = TriggerFilter({n: t for n, (_, _, t) in PATTERNS.items()})
+
+# any pattern can fire (util.preClassify prefilter)
+TRIGGERS = tuple(dict.fromkeys(t for _, _, trig in PATTERNS.values() for t in trig))
+
+
+def detect_spanish(line: str | NormalizedNarrative) -> Detection | None:
     if not line:
         return None
 
-    line = line.strip()
+    line = narrative(line.strip())
     if not line:
         return None
 
-    if is_pattern1(line):
-        return 1
-    if is_pattern2(line):
-        return 2
-    if is_pattern3(line):
-        return 3
-    if is_pattern4(line):
-        return 4
-    if is_pattern5(line):
-        return 5
-    if is_pattern6(line):
-        return 6
-    if is_pattern7(line):
-        return 7
-    if is_pattern8(line):
-        return 8
-    if is_pattern9(line):
-        return 9
-    if is_pattern10(line):
-        return 10
-    if is_pattern11(line):
-        return 11
-    if is_pattern12(line):
-        return 12
+    # patterns in order, skipping those whose triggers are absent
+    can = PATTERN_FILTER.mask(line.form("no_pipes"))
+    for n, (is_pattern, _, _) in PATTERNS.items():
+        if can & PATTERN_FILTER.bit(n) and is_pattern(line):
+            return Detection("spanish", n)
 
     return None
 
-def spanish_parse(line: str) -> dict | None:
+
+def is_spanish(line: str | NormalizedNarrative) -> int | None:
+    d = detect_spanish(line)
+    return d.pattern if d else None
+
+def spanish_parse(line: str | NormalizedNarrative, detection=None) -> dict | None:
     
-    pat_no = is_spanish(line)
+    # detection: detect_spanish(line), when the caller already has it
+    pat_no = detection.pattern if detection is not None else is_spanish(line)
     print(f"Spanish Pattern-{pat_no}\n")
 
-    if pat_no == 1:
-        return parse_pattern1(line)
-    if pat_no == 2:
-        return parse_pattern2(line)
-    if pat_no == 3:
-        return parse_pattern3(line)
-    if pat_no == 4:
-        return parse_pattern4(line)
-    if pat_no == 5:
-        return parse_pattern5(line)
-    if pat_no == 6:
-        return parse_pattern6(line)
-    if pat_no == 7:
-        return parse_pattern7(line)
-    if pat_no == 8:
-        return parse_pattern8(line)
-    if pat_no == 9:
-        return parse_pattern9(line)
-    if pat_no == 10:
-        return parse_pattern10(line)
-    if pat_no == 11:
-        return parse_pattern11(line)
-    if pat_no == 12:
-        return parse_pattern12(line)
+    if pat_no not in PATTERNS:
+        return None
 
-    return None
+    parse = PATTERNS[pat_no][1]
+    if pat_no in RECOGNIZED_OK:
+        return parse(line, recognized=True)
+    return parse(line)
@@ -1,14 +1,11 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
 # ---------------------------------------------------------
 # 1. NORMALIZATION (shared)
 # ---------------------------------------------------------
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.strip(",")
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "commas")
 
 
 # ---------------------------------------------------------
@@ -19,7 +16,7 @@ VENDOR_PAY_RECOGNISE_RE = re.compile(
 )
 
 
-def is_vendor_pay_narrative(line: str) -> bool:
+def is_vendor_pay_narrative(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -42,7 +39,7 @@ VENDOR_PAY_PARSE_RE = re.compile(
 )
 
 
-def parse_vendor_pay_narrative(line: str) -> dict:
+def parse_vendor_pay_narrative(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     match = VENDOR_PAY_PARSE_RE.search(norm)
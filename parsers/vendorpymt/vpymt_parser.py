@@ -1,16 +1,12 @@
 import re
+from parsers.narrative import NormalizedNarrative, normalized
 
 # ---------------------------------------------------------
 # NORMALIZATION (UNCHANGED BEHAVIOR)
 # ---------------------------------------------------------
 
-def normalize_narrative(line: str) -> str:
-    if not line:
-        return ""
-    line = line.lstrip(",")
-    line = re.sub(r"[,\s]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "lead_comma_tail")
 
 
 # ---------------------------------------------------------
@@ -31,11 +27,11 @@ VENDORPYMT_REMIT_RECOGNISE_RE = re.compile(
 
 
 
-def is_vendor_payment_rmr(line: str) -> bool:
+def is_vendor_payment_rmr(line: str | NormalizedNarrative) -> bool:
     return bool(VENDORPYMT_RMR_RE.search(normalize_narrative(line)))
 
 
-def is_vendor_payment_remittance(line: str) -> bool:
+def is_vendor_payment_remittance(line: str | NormalizedNarrative) -> bool:
     norm = normalize_narrative(line)
     if not norm:
         return False
@@ -89,7 +85,7 @@ AMOUNT_RE  = re.compile(r"\*\*\s*([\d ]+(?:\.\d{2})?)")
 # ---------------------------------------------------------
 # PARSER
 # ---------------------------------------------------------
-def parse_vendor_payment_rmr(line: str) -> dict:
+def parse_vendor_payment_rmr(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line).rstrip("\\")
     m = VENDORPYMT_RMR_PARSE_RE.search(norm)
     if not m:
@@ -116,7 +112,7 @@ def parse_vendor_payment_rmr(line: str) -> dict:
 
 
 
-def parse_vendor_payment_remittance(line: str) -> dict:
+def parse_vendor_payment_remittance(line: str | NormalizedNarrative) -> dict:
     norm = normalize_narrative(line)
 
     m = VENDORPYMT_REMIT_PARSE_RE.search(norm)
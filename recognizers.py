@@ -0,0 +1,212 @@
+import re
+from collections import namedtuple
+
+from parsers.disbursement.disb_parser import is_disbursement_narrative, parse_disbursement_narrative
+from parsers.fundsTransfer.fundsTrans_parser import is_funds_transfer_frmdep, parse_funds_transfer_frmdep
+from parsers.vendorpay.vp_parser import is_vendor_pay_narrative, parse_vendor_pay_narrative
+from parsers.vendorpymt.vpymt_parser import (
+    is_vendor_payment_remittance, is_vendor_payment_rmr,
+    parse_vendor_payment_remittance, parse_vendor_payment_rmr,
+)
+from parsers.avidpay.avidp_check_parser import is_avidpay_check, parse_avidpay_check
+from parsers.avidpay.avidp_gen_parser import is_avidpay_generic, parse_avidpay_generic
+from parsers.misc.cardp import is_card_payment, parse_card_payment
+from parsers.misc.invo import is_invoice_reference, parse_invoice_reference
+from parsers.misc.webt import is_web_transfer, parse_web_transfer
+from parsers.remittance.remi import is_remittance_advice, parse_remittance_advice
+from parsers.merchref.merch_ref_parser import is_merchant_reference, parse_merchant_reference
+from parsers.paypal.paypal import detect_paypal, parse_paypal
+from parsers.processor_eft.peft import match_processor_eft, parse_processor_eft
+from parsers.directdebit.directdeb import is_direct_debit, parse_direct_debit
+from parsers.spanish_types.spanish import detect_spanish, spanish_parse, TRIGGERS as SPANISH_TRIGGERS
+
+from parsers.detection import Detection
+from parsers.narrative import NormalizedNarrative, narrative
+from parsers.prefilter import TriggerFilter
+
+
+# name      format preClassify returns
+# recognize narrative -> falsy when it does not fire, else True, a
+#           re.Match or a Detection (see _detection)
+# parse     narrative -> parsed output
+# priority  lower runs first
+# hold      only kept when keyword scoring finds no swift / ach / wire
+# triggers  literals recognize cannot match without ("^" = at the start),
+#           () = always run
+# formats   names routed to parse, "PREFIX*" for a family
+# takes_detection
+#           parse(narr, detection=...) reuses what recognize found
+Format = namedtuple(
+    "Format",
+    "name recognize parse priority hold triggers formats takes_detection"
+)
+
+
+def _detection(name: str, hit) -> Detection:
+    if isinstance(hit, Detection):
+        return hit
+    if isinstance(hit, re.Match):
+        return Detection(name, None, hit)
+    return Detection(name)
+
+
+class RecognizerRegistry:
+    """
+    Additional (non key-parser) formats and how to dispatch them.
+
+    Everything preClassify, detect_format and route_to_additional_format
+    used to hard-code is declared once per format with register(); the
+    dispatch tables are built from that on first use:
+
+    - detect(): recognizers by priority, behind the trigger prefilter
+    - is_hold(): hold formats
+    - parser(): parser by format name, one dict lookup
+    - route(): runs it, handing over the Detection when the parser
+      takes one, so nothing is recognized twice
+    """
+
+    def __init__(self):
+        self.formats = {}
+        self._compiled = None
+
+    def register(
+        self,
+        name: str,
+        recognize,
+        parse,
+        priority: int,
+        hold: bool = False,
+        triggers=(),
+        formats=None,
+        takes_detection: bool = False
+    ) -> Format:
+        if name in self.formats:
+            raise ValueError(f"Format {name!r} is already registered")
+
+        fmt = Format(
+            name, recognize, parse, priority, hold,
+            tuple(triggers), tuple(formats or (name,)), takes_detection
+        )
+        self.formats[name] = fmt
+        self._compiled = None
+        return fmt
+
+    def _compile(self):
+        # stable: equal priorities keep registration order
+        ordered = sorted(self.formats.values(), key=lambda f: f.priority)
+        prefilter = TriggerFilter({f.name: f.triggers for f in ordered})
+
+        table = tuple((prefilter.bit(f.name), f.name, f.recognize) for f in ordered)
+        hold = frozenset(f.name for f in ordered if f.hold)
+
+        # format name -> Format
+        routes, prefixes = {}, []
+        for f in ordered:
+            for name in f.formats:
+                if name.endswith("*"):
+                    prefixes.append((name[:-1], f))
+                else:
+                    routes[name] = f
+
+        self._compiled = (prefilter, table, hold, routes, tuple(prefixes))
+        return self._compiled
+
+    def detect(self, text) -> Detection:
+        """
+        Detection of the first recognizer (by priority) that fires,
+        Detection("done") if none does.
+        """
+        prefilter, table, _, _, _ = self._compiled or self._compile()
+
+        # every recognizer reads its normalized form from one shared object
+        text = narrative(text)
+
+        # recognizers whose triggers are present, the rest cannot fire
+        can = prefilter.mask(text.form("no_pipes"))
+
+        for bit, name, recognize in table:
+            if can & bit:
+                hit = recognize(text)
+                if hit:
+                    return _detection(name, hit)
+
+        return Detection("done")
+
+    def classify(self, text) -> str:
+        return self.detect(text).format
+
+    def is_hold(self, fmt: str) -> bool:
+        return fmt in (self._compiled or self._compile())[2]
+
+    def _format(self, fmt: str) -> Format | None:
+        _, _, _, routes, prefixes = self._compiled or self._compile()
+
+        f = routes.get(fmt)
+        if f is None:
+            for prefix, p in prefixes:
+                if fmt.startswith(prefix):
+                    return p
+        return f
+
+    def parser(self, fmt: str):
+        f = self._format(fmt)
+        return f.parse if f else None
+
+    def route(self, fmt: str | Detection, narr: str | NormalizedNarrative):
+        """
+        (parsed, format name) when the format has a parser, else
+        (None, None). With a Detection of `narr` the parser reuses it.
+        """
+        detection = fmt if isinstance(fmt, Detection) else None
+        if detection is not None:
+            fmt = detection.format
+
+        f = self._format(fmt)
+        if f is None:
+            return None, None
+        if detection is not None and f.takes_detection:
+            return f.parse(narr, detection=detection), fmt
+        return f.parse(narr), fmt
+
+
+RECOGNIZERS = RecognizerRegistry()
+
+# preClassify order; hold formats yield to swift / ach / wire scoring
+RECOGNIZERS.register(
+    "spanish", detect_spanish, spanish_parse, 10,
+    triggers=SPANISH_TRIGGERS,
+    takes_detection=True
+)
+RECOGNIZERS.register(
+    "paypal", detect_paypal, parse_paypal, 20,
+    triggers=("PAYPAL",),
+    formats=("PAYPAL*",),
+    takes_detection=True
+)
+RECOGNIZERS.register(
+    "disbursement", is_disbursement_narrative, parse_disbursement_narrative, 30,
+    triggers=("DISBURSEME",)
+)
+RECOGNIZERS.register("fundstr", is_funds_transfer_frmdep, parse_funds_transfer_frmdep, 40, triggers=("TRANSF",))
+RECOGNIZERS.register(
+    "vpay_remit", is_vendor_payment_remittance, parse_vendor_payment_remittance, 50,
+    triggers=("VENDORPYMT",)
+)
+RECOGNIZERS.register("vpymt", is_vendor_payment_rmr, parse_vendor_payment_rmr, 60, triggers=("VENDORPYMT",))
+RECOGNIZERS.register("vpay", is_vendor_pay_narrative, parse_vendor_pay_narrative, 70, triggers=("VENDOR PAY",))
+RECOGNIZERS.register("avp_check", is_avidpay_check, parse_avidpay_check, 80, hold=True, triggers=("AVIDPAY",))
+RECOGNIZERS.register("avp_gen", is_avidpay_generic, parse_avidpay_generic, 90, hold=True, triggers=("AVIDPAY",))
+RECOGNIZERS.register("card", is_card_payment, parse_card_payment, 100, triggers=("PMT",))
+RECOGNIZERS.register("invo", is_invoice_reference, parse_invoice_reference, 110, triggers=("INVOICE",))
+RECOGNIZERS.register("webt", is_web_transfer, parse_web_transfer, 120, triggers=("WEB TFR",))
+RECOGNIZERS.register(
+    "peft", match_processor_eft, parse_processor_eft, 130,
+    hold=True,
+    takes_detection=True
+)
+RECOGNIZERS.register("remi", is_remittance_advice, parse_remittance_advice, 140, triggers=("RMR*",))
+RECOGNIZERS.register("merch", is_merchant_reference, parse_merchant_reference, 150)
+RECOGNIZERS.register(
+    "ddbt", is_direct_debit, parse_direct_debit, 160,
+    triggers=("DIRECT", "PAYMENT", "PYMT", "WITHDRAW", "AUTO", "SUBSCRIPT", "MEMBERSHIP", "RENT")
+)
@@ -1,86 +1,81 @@
 import json
-import re
 from pathlib import Path
 
-def routine1(hitl,fmt:str):
-    print(f'NEW KEY-VALUE PAIRS DETECTED.')
-    print(f'ADD THEM TO THE {fmt} LIST')
-    for key in hitl[1]:
-            print(f'{key} : {hitl[1][key]}')
-    print()
-
+from key_engine.store_file import write_json_atomic
+from parsers.key_registry import file_lock, registry
 
+PROJECT_ROOT = Path(__file__).resolve().parent
+CANONICAL_PATH = PROJECT_ROOT / "key_engine" / "canonical_keys.json"
+CANONICAL_LOCK = PROJECT_ROOT / "key_engine" / "canonical_keys.json.lock"
 
 def routine2(canonical_key: str, val_name: str, fmt: str, inline: bool = False):
-
-    canonical_key = canonical_key.strip().lower()
-    val = val_name.strip()
-    if not canonical_key or not val:
-        return
-
-    val_upper = val.upper()
-    project_root = Path(__file__).resolve().parent
-
-    # ---------- update canonical_keys.json ----------
-    canonical_path = project_root / "key_engine" / "canonical_keys.json"
-    with open(canonical_path, "r", encoding="utf-8") as f:
-        canonical = json.load(f)
-
-    canonical.setdefault(canonical_key, [])
-    if val.lower() not in canonical[canonical_key]:
-        canonical[canonical_key].append(val.lower())
-        with open(canonical_path, "w", encoding="utf-8") as f:
-            json.dump(canonical, f, indent=2)
-
-    # ---------- append to format-specific keys ----------
-    fmt_keys_path = project_root / "parsers" / fmt / "keys.py"
-    _append_to_keys_py(fmt_keys_path, val_upper, inline)
-
-    # ---------- append to parsers/all/keys.py ----------
-    if fmt.lower() != "unknown":
-        all_keys_path = project_root / "parsers" / "all" / "keys.py"
-        _append_to_keys_py(all_keys_path, val_upper, inline)
-
-
-def _append_to_keys_py(keys_path: Path, val_upper: str, inline: bool):
-    text = keys_path.read_text(encoding="utf-8")
-    target = "INLINE_KEYS" if inline else "KEYS"
-
-    start = text.find(f"{target} = [")
-    if start == -1:
-        raise RuntimeError(f"{target} list not found in {keys_path}")
-
-    open_bracket = text.find("[", start)
-    close_bracket = text.find("]", open_bracket)
-
-    if open_bracket == -1 or close_bracket == -1:
-        raise RuntimeError(f"Malformed {target} list in {keys_path}")
-
-    # extract list body
-    body = text[open_bracket + 1 : close_bracket]
-
-    # parse values
-    values = []
-    for item in body.split(","):
-        item = item.strip().strip("'").strip('"')
-        if item:
-            values.append(item)
-
-    # add if missing
-    if val_upper not in values:
-        values.append(val_upper)
-
-    # dedupe + sort DESC by length
-    values = sorted(set(values), key=lambda x: (-len(x), x))
-
-    # rebuild list (pretty)
-    rebuilt = f"{target} = [\n"
-    for v in values:
-        rebuilt += f'    "{v}",\n'
-    rebuilt += "]"
-
-    # replace old list
-    new_text = text[:start] + rebuilt + text[close_bracket + 1 :]
-
-    keys_path.write_text(new_text, encoding="utf-8")
-
+    approve_many([(canonical_key, val_name, fmt, inline)])
+
+
+def approve_many(approvals, detector=None) -> dict:
+    """
+    Applies many HITL approvals at once.
+
+    approvals: (canonical_key, val_name, fmt[, inline]) tuples or dicts
+    with those names, same meaning as routine2().
+
+    The whole batch runs under one lock on canonical_keys.json, every
+    store is written once (temp file + rename), and `detector`, if
+    given, rebuilds its index once at the end.
+    Every key also goes to the "all" registry, fmt "unknown" only there.
+    Formats without a parsers/<fmt>/keys.json only update the canonical
+    store and are listed under "no_registry".
+    Returns {"canonical_added": n, "versions": {fmt: registry version},
+    "no_registry": [fmt, ...]}.
+    """
+    canonical_new = []
+    # fmt -> {"keys": [...], "inline_keys": [...]}
+    parser_new = {}
+
+    for a in approvals:
+        if isinstance(a, dict):
+            a = (a["canonical_key"], a["val_name"], a["fmt"], a.get("inline", False))
+        canonical_key, val_name, fmt, *rest = a
+        inline = rest[0] if rest else False
+
+        canonical_key = canonical_key.strip().lower()
+        val = val_name.strip()
+        if not canonical_key or not val:
+            continue
+
+        canonical_new.append((canonical_key, val.lower()))
+
+        target = "inline_keys" if inline else "keys"
+        # unknown-format narratives are parsed by all_parser (see
+        # script.KEY_PARSERS), so their keys go to the "all" registry
+        fmts = ["all"] if fmt.lower() == "unknown" else [fmt, "all"]
+        for f in fmts:
+            parser_new.setdefault(f, {"keys": [], "inline_keys": []})[target].append(val.upper())
+
+    added = 0
+    versions = {}
+    no_registry = sorted(f for f in parser_new if not registry(f).path.exists())
+
+    with file_lock(CANONICAL_LOCK):
+        # ---------- update canonical_keys.json ----------
+        with open(CANONICAL_PATH, "r", encoding="utf-8") as f:
+            canonical = json.load(f)
+
+        for canonical_key, val in canonical_new:
+            canonical.setdefault(canonical_key, [])
+            if val not in canonical[canonical_key]:
+                canonical[canonical_key].append(val)
+                added += 1
+
+        if added:
+            write_json_atomic(CANONICAL_PATH, canonical)
+
+        # ---------- format key registries, one write each ----------
+        for fmt in sorted(parser_new):
+            if fmt not in no_registry:
+                versions[fmt] = registry(fmt).add(**parser_new[fmt])
+
+    if detector is not None and added:
+        detector.refresh()
+
+    return {"canonical_added": added, "versions": versions, "no_registry": no_registry}
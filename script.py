@@ -1,12 +1,14 @@
 import json
-from util import detect_format, normalize_spaces
+import logging
+from util import detect
+from parsers.narrative import narrative
 from parsers.wire.wire_parser import wire_parser
 from parsers.ach.ach_parser import ach_parser
 from parsers.swift.swift_parser import swift_parser
 from parsers.all.all_parser import all_parser
 
 from key_engine.key_detector import KeyDetector
-from routines import routine1, routine2
+from hitl_capture import HitlCapture
 
 import numpy as np
 import pandas as pd
@@ -14,32 +16,41 @@ import pandas as pd
 from additionalFmts import route_to_additional_format
 from extract_payer_payee import extract_payor_payee
 
+# key-parser formats, anything else goes through all_parser
+KEY_PARSERS = {
+    'wire': wire_parser,
+    'ach': ach_parser,
+    'swift': swift_parser,
+}
+
+log = logging.getLogger(__name__)
+
 key_detector = KeyDetector()
+# unknown keys are queued and aggregated in the background,
+# with their nearest canonical keys
+hitl_capture = HitlCapture(suggest=key_detector.suggest)
 
 
 def parse(narr: str):
 
-    fmt = detect_format(narr)
-    print(f"\nFORMAT IDENTIFIED: {fmt}")
+    # normalized once, shared by the recognizers and parsers
+    nn = narrative(narr)
 
-    parsed, routed_fmt = route_to_additional_format(fmt, narr)
+    det = detect(nn)
+    fmt = det.format
+    log.debug("format identified: %s", fmt)
+
+    parsed, routed_fmt = route_to_additional_format(det, nn)
     if routed_fmt:
         return parsed, routed_fmt
     
-    narr = normalize_spaces(narr)
+    narr = nn.spaced
     rewritten_narr, hitl = key_detector.rewrite(narr)
 
     if hitl:
-        routine1(hitl, fmt)
-
-    if fmt == 'wire':
-        output = wire_parser(rewritten_narr)
-    elif fmt == 'ach':
-        output = ach_parser(rewritten_narr)
-    elif fmt == 'swift':
-        output = swift_parser(rewritten_narr)
-    else:
-        output = all_parser(rewritten_narr)
+        hitl_capture.capture(hitl, fmt, narr)
+
+    output = KEY_PARSERS.get(fmt, all_parser)(rewritten_narr)
 
     return output, fmt
 
@@ -1,32 +1,12 @@
-import re
-
-from parsers.disbursement.disb_parser import is_disbursement_narrative
-from parsers.fundsTransfer.fundsTrans_parser import is_funds_transfer_frmdep
-from parsers.vendorpay.vp_parser import is_vendor_pay_narrative
-from parsers.vendorpymt.vpymt_parser import is_vendor_payment_remittance,is_vendor_payment_rmr
-from parsers.avidpay.avidp_check_parser import is_avidpay_check
-from parsers.avidpay.avidp_gen_parser import is_avidpay_generic
-from parsers.misc.cardp import is_card_payment
-from parsers.misc.invo import is_invoice_reference
-from parsers.misc.webt import is_web_transfer
-from parsers.remittance.remi import is_remittance_advice
-from parsers.merchref.merch_ref_parser import is_merchant_reference
-from parsers.paypal.paypal import classify_paypal
-from parsers.processor_eft.peft import is_processor_eft
-from parsers.directdebit.directdeb import is_direct_debit
-
-from parsers.spanish_types.spanish import is_spanish
+from parsers.detection import Detection
+from parsers.keywords import KeywordScorer
+from parsers.narrative import NormalizedNarrative, narrative, normalized
 
-def normalize_spaces(text: str) -> str:
-    
-    text = text.replace('.','')
-    text = text.replace(',',' ')
-
-    # add space BEFORE and AFTER delimiter if missing
-    text = re.sub(r"(?<!\s)([:,=;#])", r" \1", text)
-    text = re.sub(r"([:,=;#])(?!\s)", r"\1 ", text)
+from recognizers import RECOGNIZERS
 
-    return " ".join(text.split())
+def normalize_spaces(text: str) -> str:
+    # drop ".", "," -> " ", space around [:=;#] (see parsers/narrative.py)
+    return normalized(text, "spaced")
 
 
 # KEYWORDS WITH WEIGHTS 
@@ -47,117 +27,74 @@ KEYWORDS = {
 
 PRIORITY = ["swift", "wire", "ach"]
 
+# compiled once: whole words / phrases, and the old substring scoring
+SCORER = KeywordScorer(KEYWORDS)
+SUBSTRING_SCORER = KeywordScorer(KEYWORDS, strict=False)
+
 
-def normalize_for_detect(text: str) -> str:
-    text = text.lower()
-    text = re.sub(r"[.,:/\-]", " ", text)
-    return normalize_spaces(text)
+def normalize_for_detect(text: str | NormalizedNarrative) -> str:
+    return normalized(text, "detect")
 
-def normalize_narrative(line: str) -> str:
-    if not line: return ""
-    line = re.sub(r"^[,\|]+", "", line)
-    line = re.sub(r"[,\|\\]+$", "", line)
-    line = re.sub(r"\s+", " ", line)
-    return line.strip().upper()
+def normalize_narrative(line: str | NormalizedNarrative) -> str:
+    return normalized(line, "edges")
 
 
 # pre-classify
 
-def preClassify(text: str) -> str:
-    
-    if is_spanish(text)!=None:
-        return 'spanish'
-
-    if classify_paypal(text)!=None:
-        return classify_paypal(text) 
-    
-    if is_disbursement_narrative(text):
-        return 'disbursement'
-
-    if is_funds_transfer_frmdep(text):
-        return 'fundstr'
-
-    if is_vendor_payment_remittance(text):
-        return "vpay_remit"
-
-    if is_vendor_payment_rmr(text):     
-        return 'vpymt'
-
-    if is_vendor_pay_narrative(text):
-        return 'vpay'
-
-    if is_avidpay_check(text):
-        return 'avp_check'
-    
-    if is_avidpay_generic(text):
-        return 'avp_gen'
-    
-    if is_card_payment(text):
-        return 'card'
-    
-    if is_invoice_reference(text):
-        return 'invo'
-    
-    if is_web_transfer(text):
-        return 'webt'
-    
-    if is_processor_eft(text):
-        return "peft"
-    
-    if is_remittance_advice(text):
-        return 'remi'
-    
-    if is_merchant_reference(text):
-        return 'merch'
-    
-    if is_direct_debit(text):
-        return 'ddbt'
-
-    return 'done'
+def preClassify(text: str | NormalizedNarrative) -> str:
+    # registered recognizers by priority, behind the trigger prefilter
+    # (see recognizers.py)
+    return RECOGNIZERS.classify(text)
 
 
 # FORMAT DETECTOR 
 
-def detect_format(text: str) -> str:
+def detect(text: str | NormalizedNarrative, strict: bool = True) -> Detection:
+    """
+    detect_format() with what the recognizer found (sub-pattern, match):
+    hand it to route_to_additional_format() so it is not found twice.
 
-    pc = preClassify(text)
+    strict=False scores keywords as substrings ("tel" in "hotel"), as
+    before whole-word matching.
+    """
+    text = narrative(text)
+    det = RECOGNIZERS.detect(text)
+    pc = det.format
 
     # --- HOLD FORMATS ---
-    HOLD_LIST = {"peft", "avp_check", "avp_gen"}
-    hold_flag = pc in HOLD_LIST
+    hold_flag = RECOGNIZERS.is_hold(pc)
 
     # if pc is something else and not "done", return it normally
     if pc != "done" and not hold_flag:
-        return pc
+        return det
 
     # ----- SCORING SECTION -----
-    t = normalize_for_detect(text)
-    scores = {k: 0 for k in KEYWORDS}
-
-    for fmt, items in KEYWORDS.items():
-        for keyword, weight in items:
-            if keyword in t:
-                scores[fmt] += weight
+    scorer = SCORER if strict else SUBSTRING_SCORER
+    scores, matched = scorer.score(text.detect)
 
     # HARD GUARD
-    if "uetr" in t:
-        return "swift"
+    if "uetr" in matched:
+        return Detection("swift")
 
     best = max(scores, key=lambda k: scores[k])
 
     # scoring failed → return held format
     if scores[best] < 3:
         if hold_flag:
-            return pc
-        return "unknown"
+            return det
+        return Detection("unknown")
 
     # tie resolution
     tied = [k for k, v in scores.items() if v == scores[best]]
     for p in PRIORITY:
         if p in tied:
-            return p
+            return Detection(p)
+
+    return Detection(best)
+
 
-    return best
+def detect_format(text: str | NormalizedNarrative, strict: bool = True) -> str:
+    return detect(text, strict).format
 
 
 if __name__=='__main__':